@@ -1,56 +1,220 @@
 from flask import Flask, request, abort
-import os, json, datetime, gspread
+import os, datetime, threading, time, atexit, collections, hmac
+from time import time as _now
+import orjson, httpx
+from concurrent.futures import ThreadPoolExecutor
 from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import Request as GoogleAuthRequest
 
 # ── ENV vars expected in Render dashboard ──────────────────────────
 SHEET_ID      = os.getenv("GSHEET_ID")
 SA_JSON_B64   = os.getenv("GOOGLE_SA_JSON_B64")       # service-account key, base64
-LOOPS_SECRET  = os.getenv("LOOPS_WEBHOOK_SECRET", "") # blank means: no signature check
+LOOPS_SECRET  = os.getenv("LOOPS_WEBHOOK_SECRET", "") # blank: unsigned in dev, every request rejected in prod
+IS_PROD       = os.getenv("ENVIRONMENT") == "production" or bool(os.getenv("RENDER"))
+FLUSH_SECS    = float(os.getenv("LOOPS_FLUSH_SECS", "2"))   # max time a row waits in the buffer
+FLUSH_ROWS    = int(os.getenv("LOOPS_FLUSH_ROWS", "500"))   # flush early once this many rows queue up
+APPEND_TRIES  = int(os.getenv("LOOPS_APPEND_TRIES", "5"))   # attempts per batch on 429/503/network errors
+TRACKED_EVENTS = os.getenv("LOOPS_TRACKED_EVENTS", "")   # comma-separated allowlist; blank: record every event
 # ────────────────────────────────────────────────────────────────────
 
 app = Flask(__name__)
 
+_KEY = LOOPS_SECRET.encode() if LOOPS_SECRET else None
+_ZERO_DIGEST = bytes(32)  # stand-in for malformed signatures so compare_digest still runs
+
 # ---- Google Sheets auth ----
-import base64, tempfile, pathlib
-tmp_key = pathlib.Path(tempfile.gettempdir()) / "sa.json"
-tmp_key.write_bytes(base64.b64decode(SA_JSON_B64))
+import base64
+creds = Credentials.from_service_account_info(  # decoded in memory, never written to disk
+    orjson.loads(base64.b64decode(SA_JSON_B64)),
+    scopes=["https://www.googleapis.com/auth/spreadsheets"],
+)
+
+# Talk to the Sheets REST API directly: one pooled HTTP/2 client, no gspread
+# worksheet metadata lookups, one values:append call per batch.
+APPEND_URL = (
+    f"https://sheets.googleapis.com/v4/spreadsheets/{SHEET_ID}"
+    "/values/loops_raw!A:H:append"  # create tab manually
+)
+APPEND_PARAMS = {"valueInputOption": "USER_ENTERED", "insertDataOption": "INSERT_ROWS"}
+_http = httpx.Client(http2=True, timeout=30.0)
+_token_lock = threading.Lock()
+
+def _bearer() -> str:
+    # Refresh the access token a minute before it expires, not per request.
+    with _token_lock:
+        if (not creds.valid or creds.expiry is None
+                or creds.expiry - datetime.datetime.utcnow() < datetime.timedelta(seconds=60)):
+            creds.refresh(GoogleAuthRequest())
+        return creds.token
+
+def append_rows(body: bytes) -> None:
+    # body is an already-serialized {"values": [...]} payload.
+    resp = _http.post(
+        APPEND_URL,
+        params=APPEND_PARAMS,
+        headers={"Authorization": f"Bearer {_bearer()}", "Content-Type": "application/json"},
+        content=body,
+    )
+    resp.raise_for_status()
+
+# ---- row buffer ----
+# Webhooks only enqueue; a daemon thread ships rows to Sheets in one
+# values:append call per batch so the request never waits on Google.
+QUEUE = collections.deque()
+_queue_lock = threading.Lock()
+_wake = threading.Event()
+
+def _iso(ts: float) -> str:
+    # UTC, naive ISO-8601 with milliseconds -- same shape the sheet already holds.
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ts)) + ".%03d" % (ts % 1 * 1000)
+
+_RETRY_STATUS = frozenset({429, 503})
+# Appends run off the flusher thread so a slow or rate-limited Sheets call
+# never holds up draining the queue. Batches carry their own timestamps, so
+# overlapping appends landing out of order is fine.
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="loops-append")
+
+def _requeue(batch):
+    with _queue_lock:
+        QUEUE.extendleft(reversed(batch))
+
+def _do_append(batch, requeue=True):
+    # Rows are flat lists of primitives (epoch secs until now); one orjson
+    # pass per batch, and the bytes are reused across retries.
+    body = orjson.dumps({"values": [[_iso(r[0]), *r[1:]] for r in batch]})
+    delay = 1.0
+    for attempt in range(1, APPEND_TRIES + 1):
+        try:
+            append_rows(body)
+            return
+        except Exception as e:
+            err = e
+            # 429/503 and network errors are transient; anything else (400, 403,
+            # a bad payload) will fail the same way every time.
+            retryable = (isinstance(e, httpx.TransportError)
+                         or (isinstance(e, httpx.HTTPStatusError)
+                             and e.response.status_code in _RETRY_STATUS))
+            if not retryable or attempt == APPEND_TRIES:
+                break
+        time.sleep(delay)  # back off: 1s, 2s, 4s, ...
+        delay *= 2
+    if retryable and requeue:
+        app.logger.error("loops flush failed; re-queueing %d rows", len(batch), exc_info=err)
+        _requeue(batch)
+    else:
+        app.logger.error("loops flush failed; dropping %d rows: %r", len(batch), batch, exc_info=err)
 
-creds = Credentials.from_service_account_file(
-    str(tmp_key), scopes=["https://www.googleapis.com/auth/spreadsheets"]
+def _take_batch():
+    global QUEUE
+    with _queue_lock:
+        if not QUEUE:
+            return None
+        batch, QUEUE = QUEUE, collections.deque()
+    return batch
+
+def flush():
+    batch = _take_batch()
+    if batch is None:
+        return
+    try:
+        _POOL.submit(_do_append, batch)
+    except RuntimeError:  # pool already shut down (exiting): _final_flush ships these
+        _requeue(batch)
+
+def _final_flush():
+    # At exit the pool is gone: append what's left synchronously, once.
+    batch = _take_batch()
+    if batch is not None:
+        _do_append(batch, requeue=False)
+
+def _flusher():
+    while True:
+        _wake.wait(FLUSH_SECS)
+        _wake.clear()
+        flush()
+
+threading.Thread(target=_flusher, name="loops-flusher", daemon=True).start()
+# atexit is LIFO: wait for in-flight appends (failures re-queue), then append
+# the remaining rows synchronously, then close the client.
+atexit.register(_http.close)
+atexit.register(_final_flush)
+atexit.register(_POOL.shutdown)  # gunicorn runs atexit handlers on SIGTERM shutdown
+
+# None: no allowlist configured, every event is recorded (as before).
+_TRACKED = frozenset(e.strip() for e in TRACKED_EVENTS.split(",") if e.strip()) or None
+
+# Sheet columns C..H: (payload key, default) in column order.
+_FIELDS = (
+    ("campaign_name", None),
+    ("emails_sent", 0),
+    ("emails_opened", 0),
+    ("emails_clicked", 0),
+    ("emails_unsubscribed", 0),
+    ("new_signups", 0),
 )
-gc = gspread.authorize(creds)
-ws = gc.open_by_key(SHEET_ID).worksheet("loops_raw")  # create tab manually
 
 # ---- helpers ----
-def verify_sig(raw: bytes, sig: str) -> bool:
-    if not LOOPS_SECRET:   # founder didn’t give one yet
-        return True
-    import hmac, hashlib
-    mac = hmac.new(LOOPS_SECRET.encode(), raw, hashlib.sha256).hexdigest()
-    return hmac.compare_digest(mac, sig)
+def _get_body(req):
+    # Materialize the body once per request; signature check and JSON parse share it.
+    raw = getattr(req, "_cached_raw", None)
+    if raw is None:
+        raw = req._cached_raw = req.get_data(cache=True)
+    return raw
+
+def _get_json(req):
+    if not hasattr(req, "_cached_json"):
+        req._cached_json = orjson.loads(_get_body(req))
+    return req._cached_json
+
+def _verify_sig_real(raw: bytes, sig: str) -> bool:
+    expected = hmac.digest(_KEY, raw, "sha256")  # one-shot OpenSSL HMAC, no HMAC object
+    if sig.startswith("sha256="):
+        sig = sig[7:]
+    try:
+        provided = bytes.fromhex(sig)
+    except ValueError:
+        hmac.compare_digest(expected, _ZERO_DIGEST)
+        return False
+    return hmac.compare_digest(expected, provided)
+
+def _reject_all(raw: bytes, sig: str) -> bool:
+    return False
+
+def _accept_all(raw: bytes, sig: str) -> bool:
+    return True
+
+# Decide once at import; the request path never re-checks the config.
+if LOOPS_SECRET:
+    verify_sig = _verify_sig_real
+elif IS_PROD:   # fail closed: no secret configured in production
+    app.logger.error("LOOPS_WEBHOOK_SECRET is not set; rejecting all /loops requests")
+    verify_sig = _reject_all
+else:           # local dev without a secret
+    verify_sig = _accept_all
 
 @app.post("/loops")
 def loops():
-    raw = request.get_data()
-    if not verify_sig(raw, request.headers.get("X-Loops-Signature", "")):
+    if not verify_sig(_get_body(request), request.headers.get("X-Loops-Signature", "")):
         abort(401)
 
-    payload = request.json
+    try:
+        payload = _get_json(request)
+    except orjson.JSONDecodeError:
+        abort(400)
     evt     = payload.get("event", "unknown")
+    if _TRACKED is not None and evt not in _TRACKED:  # not on the allowlist: skip the row build and enqueue
+        app.logger.debug("loops event not tracked, ignoring: %r", evt)
+        return "", 204
     data    = payload.get("data", {})
 
-    row = [
-        datetime.datetime.utcnow().isoformat(),
-        evt,
-        data.get("campaign_name"),
-        data.get("emails_sent", 0),
-        data.get("emails_opened", 0),
-        data.get("emails_clicked", 0),
-        data.get("emails_unsubscribed", 0),
-        data.get("new_signups", 0),
-    ]
-    ws.append_row(row, value_input_option="USER_ENTERED")
+    data_get = data.get
+    row = [_now(), evt, *[data_get(k, d) for k, d in _FIELDS]]
+    with _queue_lock:
+        QUEUE.append(row)
+        full = len(QUEUE) >= FLUSH_ROWS
+    if full:
+        _wake.set()
     return "", 204
 
-if __name__ == "__main__":
-    app.run(port=8000)
+# Served by gunicorn (see procfile); locally:
+#   gunicorn -w 2 -k gthread --threads 8 -b :8000 main:app
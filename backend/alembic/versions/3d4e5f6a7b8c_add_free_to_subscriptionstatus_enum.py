@@ -5,7 +5,7 @@ Revises: 94c3955325f9
 Create Date: 2025-01-20 12:00:00.000000
 
 Ensures 'free' (lowercase) enum value exists in subscriptionstatus enum type.
-Safe to run multiple times - checks if value exists before adding.
+Safe to run multiple times - uses ADD VALUE IF NOT EXISTS.
 Note: The Python enum SubscriptionStatus.FREE maps to "free" (lowercase).
 """
 from typing import Sequence, Union
@@ -22,22 +22,9 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     # Ensure 'free' (lowercase) exists in subscriptionstatus enum
-    # This is safe to run multiple times - checks if value exists before adding
+    # IF NOT EXISTS makes this safe to run multiple times (Postgres 12+)
     # The Python enum SubscriptionStatus.FREE maps to "free" (lowercase)
-    op.execute("""
-        DO $$
-        BEGIN
-            IF NOT EXISTS (
-                SELECT 1
-                FROM pg_enum e
-                JOIN pg_type t ON t.oid = e.enumtypid
-                WHERE t.typname = 'subscriptionstatus'
-                  AND e.enumlabel = 'free'
-            ) THEN
-                ALTER TYPE subscriptionstatus ADD VALUE 'free';
-            END IF;
-        END$$;
-    """)
+    op.execute("ALTER TYPE subscriptionstatus ADD VALUE IF NOT EXISTS 'free'")
 
 
 def downgrade() -> None:
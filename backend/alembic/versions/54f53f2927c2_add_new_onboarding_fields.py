@@ -38,7 +38,8 @@ def upgrade() -> None:
     op.add_column('onboarding_profiles', sa.Column('transition_summary', sa.Text(), nullable=True))
     op.add_column('onboarding_profiles', sa.Column('transition_confirmed', sa.Boolean(), nullable=True))
     op.add_column('onboarding_profiles', sa.Column('transition_correction', sa.Text(), nullable=True))
-    op.drop_index('ix_users_email_lower_unique', table_name='users', postgresql_where='(email IS NOT NULL)')
+    # 2b3c4d5e6f7a no longer creates this index (users.email is CITEXT), so it may be absent
+    op.execute("DROP INDEX IF EXISTS ix_users_email_lower_unique")
     # ### end Alembic commands ###
 
 
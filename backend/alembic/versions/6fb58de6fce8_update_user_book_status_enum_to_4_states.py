@@ -32,73 +32,59 @@ def upgrade() -> None:
         $$;
     """)
     
-    # Step 1: Add new enum values to the existing enum type (safe if already exists)
-    # Note: On a fresh DB, the baseline already created the enum with these values,
-    # so these will be no-ops. For existing DBs, they add the new values.
+    # Step 1: Rename the legacy labels in place (PG 10+). This is a catalog-only
+    # change: every existing 'read'/'interesting' row becomes 'read_liked'/'interested'
+    # without rewriting user_book_interactions or holding an exclusive lock on it.
+    # Skipped when the target label already exists (handled by Steps 3-4 below).
     op.execute("""
         DO $$
+        DECLARE
+            typ oid := (SELECT oid FROM pg_type WHERE typname = 'userbookstatus');
         BEGIN
-            -- Only add values if they don't already exist (for existing DBs)
-            IF NOT EXISTS (SELECT 1 FROM pg_enum WHERE enumlabel = 'read_liked' AND enumtypid = (SELECT oid FROM pg_type WHERE typname = 'userbookstatus')) THEN
-                ALTER TYPE userbookstatus ADD VALUE 'read_liked';
-            END IF;
-            IF NOT EXISTS (SELECT 1 FROM pg_enum WHERE enumlabel = 'read_disliked' AND enumtypid = (SELECT oid FROM pg_type WHERE typname = 'userbookstatus')) THEN
-                ALTER TYPE userbookstatus ADD VALUE 'read_disliked';
-            END IF;
-            IF NOT EXISTS (SELECT 1 FROM pg_enum WHERE enumlabel = 'interested' AND enumtypid = (SELECT oid FROM pg_type WHERE typname = 'userbookstatus')) THEN
-                ALTER TYPE userbookstatus ADD VALUE 'interested';
+            IF EXISTS (SELECT 1 FROM pg_enum WHERE enumtypid = typ AND enumlabel = 'read')
+               AND NOT EXISTS (SELECT 1 FROM pg_enum WHERE enumtypid = typ AND enumlabel = 'read_liked') THEN
+                ALTER TYPE userbookstatus RENAME VALUE 'read' TO 'read_liked';
             END IF;
-            IF NOT EXISTS (SELECT 1 FROM pg_enum WHERE enumlabel = 'not_interested' AND enumtypid = (SELECT oid FROM pg_type WHERE typname = 'userbookstatus')) THEN
-                ALTER TYPE userbookstatus ADD VALUE 'not_interested';
+            IF EXISTS (SELECT 1 FROM pg_enum WHERE enumtypid = typ AND enumlabel = 'interesting')
+               AND NOT EXISTS (SELECT 1 FROM pg_enum WHERE enumtypid = typ AND enumlabel = 'interested') THEN
+                ALTER TYPE userbookstatus RENAME VALUE 'interesting' TO 'interested';
             END IF;
         END
         $$;
     """)
     
-    # Step 2: Migrate existing data (only if table exists)
-    # Map "read" -> "read_liked" (default assumption for existing read books)
-    op.execute("""
-        DO $$
-        BEGIN
-            IF to_regclass('public.user_book_interactions') IS NOT NULL THEN
-                -- On a fresh DB, there are no rows, so this is safe
-                -- For existing DBs, we need to handle the old 'read' value
-                -- Check if any rows have the old 'read' value (as text, not enum)
-                IF EXISTS (
-                    SELECT 1 FROM user_book_interactions 
-                    WHERE status::text = 'read'
-                ) THEN
-                    -- Temporarily cast to text to compare, then update
-                    UPDATE user_book_interactions 
-                    SET status = 'read_liked'::userbookstatus 
-                    WHERE status::text = 'read';
-                END IF;
-            END IF;
-        END
-        $$;
-    """)
+    # Step 2: Add any values still missing (no-ops on a fresh DB, where the
+    # baseline already created the enum with all four values)
+    op.execute("ALTER TYPE userbookstatus ADD VALUE IF NOT EXISTS 'read_liked'")
+    op.execute("ALTER TYPE userbookstatus ADD VALUE IF NOT EXISTS 'read_disliked'")
+    op.execute("ALTER TYPE userbookstatus ADD VALUE IF NOT EXISTS 'interested'")
+    op.execute("ALTER TYPE userbookstatus ADD VALUE IF NOT EXISTS 'not_interested'")
     
-    # Map "interesting" -> "interested"
+    # Step 3: Migrate existing data (only if table exists)
+    # Only matters when a DB ended up with both the old and new labels (e.g. an
+    # earlier revision of this migration added the new values first), so the
+    # rename above could not apply. Otherwise no row carries an old label.
+    # Map "read" -> "read_liked" (default assumption for existing read books) and
+    # "interesting" -> "interested" in one pass over the table
     op.execute("""
         DO $$
         BEGIN
             IF to_regclass('public.user_book_interactions') IS NOT NULL THEN
-                -- Check if any rows have the old 'interesting' value (as text, not enum)
-                IF EXISTS (
-                    SELECT 1 FROM user_book_interactions 
-                    WHERE status::text = 'interesting'
-                ) THEN
-                    UPDATE user_book_interactions 
-                    SET status = 'interested'::userbookstatus 
-                    WHERE status::text = 'interesting';
-                END IF;
+                -- No EXISTS pre-check: it would scan the table once more, and an
+                -- UPDATE that matches nothing writes nothing (instant on a fresh DB)
+                UPDATE user_book_interactions 
+                SET status = (CASE status::text
+                    WHEN 'read' THEN 'read_liked'
+                    WHEN 'interesting' THEN 'interested'
+                END)::userbookstatus 
+                WHERE status::text IN ('read', 'interesting');
             END IF;
         END
         $$;
     """)
     
-    # Step 3: Remove old enum values by recreating the enum type
-    # Only do this if the enum has old values (for existing DBs)
+    # Step 4: Remove old enum values by recreating the enum type
+    # Only do this if the enum still has old values (the mixed-label case above)
     # On a fresh DB, the enum already has the correct values, so skip this step
     op.execute("""
         DO $$
@@ -138,28 +124,18 @@ def downgrade() -> None:
     # Step 1: Create old enum type
     op.execute("CREATE TYPE userbookstatus_old AS ENUM ('read', 'interesting', 'not_interested')")
     
-    # Step 2: Migrate data back (only if table exists)
-    # Map "read_liked" and "read_disliked" -> "read"
-    op.execute("""
-        DO $$
-        BEGIN
-            IF to_regclass('public.user_book_interactions') IS NOT NULL THEN
-                UPDATE user_book_interactions 
-                SET status = 'read'::userbookstatus_old 
-                WHERE status::text IN ('read_liked', 'read_disliked');
-            END IF;
-        END
-        $$;
-    """)
-    
-    # Map "interested" -> "interesting"
+    # Step 2: Migrate data back (only if table exists), in one pass over the table
+    # Map "read_liked" and "read_disliked" -> "read", "interested" -> "interesting"
     op.execute("""
         DO $$
         BEGIN
             IF to_regclass('public.user_book_interactions') IS NOT NULL THEN
                 UPDATE user_book_interactions 
-                SET status = 'interesting'::userbookstatus_old 
-                WHERE status::text = 'interested';
+                SET status = (CASE status::text
+                    WHEN 'interested' THEN 'interesting'
+                    ELSE 'read'
+                END)::userbookstatus_old 
+                WHERE status::text IN ('read_liked', 'read_disliked', 'interested');
             END IF;
         END
         $$;
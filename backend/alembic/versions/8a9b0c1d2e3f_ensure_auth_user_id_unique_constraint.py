@@ -5,7 +5,7 @@ Revises: 2b3c4d5e6f7a
 Create Date: 2025-01-21 14:00:00.000000
 
 Ensure auth_user_id has unique constraint and index for Supabase Auth source of truth.
-This migration is idempotent - it checks if constraints/indexes exist before creating.
+This migration is idempotent - CREATE UNIQUE INDEX ... IF NOT EXISTS, no catalog pre-check.
 """
 from typing import Sequence, Union
 
@@ -22,23 +22,14 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     # Ensure unique index on auth_user_id exists (idempotent)
-    # The index was created in add_auth_user_id migration, but we ensure it exists here
-    op.execute("""
-        DO $$
-        BEGIN
-            -- Check if unique index exists
-            IF NOT EXISTS (
-                SELECT 1
-                FROM pg_indexes
-                WHERE schemaname = 'public'
-                  AND tablename = 'users'
-                  AND indexname = 'ix_users_auth_user_id'
-            ) THEN
-                CREATE UNIQUE INDEX ix_users_auth_user_id ON users (auth_user_id)
-                WHERE auth_user_id IS NOT NULL;
-            END IF;
-        END$$;
-    """)
+    # The index was created in add_auth_user_id migration, but we ensure it exists here.
+    # CONCURRENTLY can't run in a transaction (or a DO block), hence autocommit.
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_auth_user_id
+            ON users (auth_user_id)
+            WHERE auth_user_id IS NOT NULL;
+        """)
 
 
 def downgrade() -> None:
@@ -12,6 +12,7 @@ Fix enum casing and storage issues:
 from typing import Sequence, Union
 
 from alembic import op
+import sqlalchemy as sa
 
 
 # revision identifiers, used by Alembic.
@@ -20,132 +21,81 @@ down_revision: Union[str, None] = '3d4e5f6a7b8c'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Lowercase labels each enum type must have, in declaration order
+CANONICAL_LABELS = {
+    "subscriptionstatus": ("free", "active", "canceled"),
+    "businessstage": ("idea", "pre-revenue", "early-revenue", "scaling"),
+}
+
+BATCH_SIZE = 30_000
+NIL_UUID = "00000000-0000-0000-0000-000000000000"  # sorts before every other uuid
+
+# (table, column, enum type, {stored uppercase name: canonical value})
+REPAIRS = (
+    ("users", "subscription_status", "subscriptionstatus", {
+        "FREE": "free",
+        "ACTIVE": "active",
+        "CANCELED": "canceled",
+    }),
+    ("onboarding_profiles", "business_stage", "businessstage", {
+        "IDEA": "idea",
+        "PRE_REVENUE": "pre-revenue",
+        "EARLY_REVENUE": "early-revenue",
+        "SCALING": "scaling",
+    }),
+)
+
 
 def upgrade() -> None:
     # Part A: Ensure canonical values exist in enum types
-    
-    # subscriptionstatus: ensure 'free', 'active', 'canceled' exist
-    op.execute("""
-        DO $$
-        BEGIN
-            -- Add 'free' if missing
-            IF NOT EXISTS (
-                SELECT 1 FROM pg_enum e
-                JOIN pg_type t ON t.oid = e.enumtypid
-                WHERE t.typname = 'subscriptionstatus' AND e.enumlabel = 'free'
-            ) THEN
-                ALTER TYPE subscriptionstatus ADD VALUE 'free';
-            END IF;
-            
-            -- Add 'active' if missing
-            IF NOT EXISTS (
-                SELECT 1 FROM pg_enum e
-                JOIN pg_type t ON t.oid = e.enumtypid
-                WHERE t.typname = 'subscriptionstatus' AND e.enumlabel = 'active'
-            ) THEN
-                ALTER TYPE subscriptionstatus ADD VALUE 'active';
-            END IF;
-            
-            -- Add 'canceled' if missing
-            IF NOT EXISTS (
-                SELECT 1 FROM pg_enum e
-                JOIN pg_type t ON t.oid = e.enumtypid
-                WHERE t.typname = 'subscriptionstatus' AND e.enumlabel = 'canceled'
-            ) THEN
-                ALTER TYPE subscriptionstatus ADD VALUE 'canceled';
-            END IF;
-        END$$;
-    """)
-    
-    # businessstage: ensure 'idea', 'pre-revenue', 'early-revenue', 'scaling' exist
-    op.execute("""
-        DO $$
-        BEGIN
-            -- Add 'idea' if missing
-            IF NOT EXISTS (
-                SELECT 1 FROM pg_enum e
-                JOIN pg_type t ON t.oid = e.enumtypid
-                WHERE t.typname = 'businessstage' AND e.enumlabel = 'idea'
-            ) THEN
-                ALTER TYPE businessstage ADD VALUE 'idea';
-            END IF;
-            
-            -- Add 'pre-revenue' if missing
-            IF NOT EXISTS (
-                SELECT 1 FROM pg_enum e
-                JOIN pg_type t ON t.oid = e.enumtypid
-                WHERE t.typname = 'businessstage' AND e.enumlabel = 'pre-revenue'
-            ) THEN
-                ALTER TYPE businessstage ADD VALUE 'pre-revenue';
-            END IF;
-            
-            -- Add 'early-revenue' if missing
-            IF NOT EXISTS (
-                SELECT 1 FROM pg_enum e
-                JOIN pg_type t ON t.oid = e.enumtypid
-                WHERE t.typname = 'businessstage' AND e.enumlabel = 'early-revenue'
-            ) THEN
-                ALTER TYPE businessstage ADD VALUE 'early-revenue';
-            END IF;
-            
-            -- Add 'scaling' if missing
-            IF NOT EXISTS (
-                SELECT 1 FROM pg_enum e
-                JOIN pg_type t ON t.oid = e.enumtypid
-                WHERE t.typname = 'businessstage' AND e.enumlabel = 'scaling'
-            ) THEN
-                ALTER TYPE businessstage ADD VALUE 'scaling';
-            END IF;
-        END$$;
-    """)
+    # ADD VALUE IF NOT EXISTS is a no-op for labels that are already there, so
+    # no catalog probe is needed. They run in autocommit: a value added inside
+    # a transaction can't be used by the repair UPDATEs below until it commits.
+    with op.get_context().autocommit_block():
+        for type_name, labels in CANONICAL_LABELS.items():
+            for label in labels:
+                op.execute(f"ALTER TYPE {type_name} ADD VALUE IF NOT EXISTS '{label}'")
     
     # Part B: Repair polluted rows (uppercase -> lowercase)
     # Note: This is safe even if no rows need updating
-    
-    # Fix subscriptionstatus: "FREE" -> "free", "ACTIVE" -> "active", "CANCELED" -> "canceled"
-    op.execute("""
-        UPDATE users
-        SET subscription_status = 'free'
-        WHERE subscription_status::text = 'FREE';
-    """)
-    
-    op.execute("""
-        UPDATE users
-        SET subscription_status = 'active'
-        WHERE subscription_status::text = 'ACTIVE';
-    """)
-    
-    op.execute("""
-        UPDATE users
-        SET subscription_status = 'canceled'
-        WHERE subscription_status::text = 'CANCELED';
-    """)
-    
-    # Fix businessstage: uppercase enum names -> lowercase values
-    # "IDEA" -> "idea", "PRE_REVENUE" -> "pre-revenue", etc.
-    op.execute("""
-        UPDATE onboarding_profiles
-        SET business_stage = 'idea'
-        WHERE business_stage::text = 'IDEA';
-    """)
-    
-    op.execute("""
-        UPDATE onboarding_profiles
-        SET business_stage = 'pre-revenue'
-        WHERE business_stage::text = 'PRE_REVENUE';
-    """)
-    
-    op.execute("""
-        UPDATE onboarding_profiles
-        SET business_stage = 'early-revenue'
-        WHERE business_stage::text = 'EARLY_REVENUE';
-    """)
-    
-    op.execute("""
-        UPDATE onboarding_profiles
-        SET business_stage = 'scaling'
-        WHERE business_stage::text = 'SCALING';
-    """)
+    # One CASE-based UPDATE per table, so each row is rewritten once. It runs
+    # in autocommit, BATCH_SIZE rows per statement, walking the primary key
+    # (keyset pagination) so every batch commits and releases its row locks.
+    # A transient partial index over just the polluted rows lets each batch
+    # find them without a seq scan: the repair costs O(dirty rows), not O(table).
+    conn = op.get_bind()
+    with op.get_context().autocommit_block():
+        for table, column, type_name, mapping in REPAIRS:
+            cases = " ".join(
+                f"WHEN '{bad}' THEN '{good}'::{type_name}" for bad, good in mapping.items()
+            )
+            predicate = f"{column}::text IN ({', '.join(repr(bad) for bad in mapping)})"
+            index_name = f"ix_{table}_bad_{column}"
+
+            # Never-polluted databases (the usual case) skip the index build and batches
+            if not conn.execute(sa.text(f"SELECT EXISTS (SELECT 1 FROM {table} WHERE {predicate})")).scalar():
+                continue
+
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table} (id) WHERE {predicate}")
+            batch = sa.text(f"""
+                WITH c AS (
+                    SELECT id FROM {table}
+                    WHERE {predicate} AND id > CAST(:last AS uuid)
+                    ORDER BY id
+                    LIMIT :batch_size
+                ), u AS (
+                    UPDATE {table}
+                    SET {column} = CASE {table}.{column}::text {cases} END
+                    FROM c
+                    WHERE {table}.id = c.id
+                    RETURNING {table}.id
+                )
+                SELECT id FROM u ORDER BY id DESC LIMIT 1;
+            """)
+            last = NIL_UUID
+            while last is not None:
+                last = conn.execute(batch, {"last": str(last), "batch_size": BATCH_SIZE}).scalar()
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
 
 
 def downgrade() -> None:
@@ -0,0 +1,48 @@
+"""make the user_book_feedback (user_id, book_id) index covering
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-17
+
+add_user_book_feedback_table now creates idx_user_book_feedback_user_book
+with INCLUDE (state, sentiment) and no user_id-only index for fresh
+databases; this brings existing databases in line. The covering index is
+built under a temporary name and swapped in, all CONCURRENTLY.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a3b4c5d6e7f8"
+down_revision: str = "f2a3b4c5d6e7"
+branch_labels = None
+depends_on = None
+
+
+def _has_include_columns() -> bool:
+    return op.get_bind().execute(sa.text("""
+        SELECT COALESCE((
+            SELECT i.indnatts > i.indnkeyatts
+            FROM pg_index i
+            WHERE i.indexrelid = to_regclass('idx_user_book_feedback_user_book')
+        ), false)
+    """)).scalar()
+
+
+def upgrade() -> None:
+    covered = _has_include_columns()
+    with op.get_context().autocommit_block():
+        if not covered:
+            op.execute("""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_book_feedback_user_book_cov
+                ON user_book_feedback (user_id, book_id) INCLUDE (state, sentiment)
+            """)
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_user_book_feedback_user_book")
+            op.execute("ALTER INDEX idx_user_book_feedback_user_book_cov RENAME TO idx_user_book_feedback_user_book")
+        # Leftmost prefix of the composite
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_book_feedback_user_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_book_feedback_user_id ON user_book_feedback (user_id)")
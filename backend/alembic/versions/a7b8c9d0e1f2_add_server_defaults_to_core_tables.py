@@ -0,0 +1,53 @@
+"""add server-side id/timestamp defaults to core tables
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-17
+
+The baseline now declares these defaults for fresh databases; this brings
+existing databases in line. SET DEFAULT is a catalog-only change.
+"""
+from alembic import op
+
+
+revision: str = "a7b8c9d0e1f2"
+down_revision: str = "f6a7b8c9d0e1"
+branch_labels = None
+depends_on = None
+
+
+# table -> timestamp columns created by the baseline
+CORE_TABLES = {
+    "users": ("created_at", "updated_at"),
+    "books": ("created_at", "updated_at"),
+    "onboarding_profiles": ("created_at", "updated_at"),
+    "user_book_interactions": ("created_at", "updated_at"),
+    "recommendation_sessions": ("created_at",),
+}
+
+
+def upgrade() -> None:
+    # gen_random_uuid() is core in PG13+; only older servers need pgcrypto
+    op.execute("""
+        DO $$
+        BEGIN
+            IF current_setting('server_version_num')::int < 130000 THEN
+                CREATE EXTENSION IF NOT EXISTS pgcrypto;
+            END IF;
+        END
+        $$;
+    """)
+    for table, timestamp_columns in CORE_TABLES.items():
+        clauses = ["ALTER COLUMN id SET DEFAULT gen_random_uuid()"]
+        clauses += [
+            f"ALTER COLUMN {column} SET DEFAULT timezone('utc', now())"
+            for column in timestamp_columns
+        ]
+        op.execute(f"ALTER TABLE {table} {', '.join(clauses)}")
+
+
+def downgrade() -> None:
+    for table, timestamp_columns in CORE_TABLES.items():
+        clauses = ["ALTER COLUMN id DROP DEFAULT"]
+        clauses += [f"ALTER COLUMN {column} DROP DEFAULT" for column in timestamp_columns]
+        op.execute(f"ALTER TABLE {table} {', '.join(clauses)}")
@@ -0,0 +1,49 @@
+"""add foreign keys on user_book_feedback and user_book_status.user_id
+
+Revision ID: a9b0c1d2e3f4
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-17
+
+add_user_book_feedback_table / add_user_book_status_table now declare these
+FKs for fresh databases; this brings existing databases in line. Orphaned
+rows (their user or book is gone) are deleted first, then each FK is added
+NOT VALID and validated separately so validation doesn't block writes.
+"""
+from alembic import op
+
+
+revision: str = "a9b0c1d2e3f4"
+down_revision: str = "f8a9b0c1d2e3"
+branch_labels = None
+depends_on = None
+
+# (constraint, table, column, referenced table)
+FOREIGN_KEYS = (
+    ("fk_ubf_user", "user_book_feedback", "user_id", "users"),
+    ("fk_ubf_book", "user_book_feedback", "book_id", "books"),
+    ("fk_user_book_status_user_id", "user_book_status", "user_id", "users"),
+)
+
+
+def upgrade() -> None:
+    for name, table, column, ref in FOREIGN_KEYS:
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{name}') THEN
+                    DELETE FROM {table} t
+                    WHERE NOT EXISTS (SELECT 1 FROM {ref} r WHERE r.id = t.{column});
+
+                    ALTER TABLE {table}
+                        ADD CONSTRAINT {name}
+                        FOREIGN KEY ({column}) REFERENCES {ref} (id) ON DELETE CASCADE NOT VALID;
+                END IF;
+            END$$;
+        """)
+    for name, table, _, _ in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(FOREIGN_KEYS):
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
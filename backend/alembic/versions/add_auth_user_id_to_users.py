@@ -19,9 +19,6 @@ def upgrade() -> None:
     # Add auth_user_id column
     op.add_column('users', sa.Column('auth_user_id', sa.String(), nullable=True))
     
-    # Create unique index on auth_user_id
-    op.create_index(op.f('ix_users_auth_user_id'), 'users', ['auth_user_id'], unique=True)
-    
     # Make email and password_hash nullable (for Supabase users who don't have passwords)
     op.alter_column('users', 'email',
                     existing_type=sa.String(),
@@ -29,6 +26,15 @@ def upgrade() -> None:
     op.alter_column('users', 'password_hash',
                     existing_type=sa.String(),
                     nullable=True)
+    
+    # Create unique index on auth_user_id without blocking writes to users.
+    # CONCURRENTLY cannot run inside a transaction, so autocommit_block() commits
+    # the work above first and resumes a new transaction afterwards.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_auth_user_id "
+            "ON users (auth_user_id)"
+        )
 
 
 def downgrade() -> None:
@@ -5,9 +5,10 @@ Revises: 9b0a1aada2ec
 Create Date: 2025-01-XX
 
 """
+from datetime import date
+
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -16,41 +17,97 @@ down_revision: str = "9b0a1aada2ec"  # Linear chain: comes after 9b0a1aada2ec
 branch_labels = None
 depends_on = None
 
+# Monthly partitions pre-created here, from a fixed month so the schema doesn't
+# depend on the day the migration runs; the scheduler creates the months from
+# now on (app/services/event_log_partitions.py).
+PARTITION_ANCHOR = date(2026, 10, 1)
+PARTITION_MONTHS = 12
+
+
+def _add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
 
 def upgrade() -> None:
-    op.create_table(
+    # Partitioned by month on created_at so retention is DROP TABLE of a month,
+    # and each partition's indexes stay small. The partition key must be part
+    # of the primary key.
+    op.execute("""
+        CREATE TABLE event_logs (
+            id UUID NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            user_id UUID,
+            event_name VARCHAR NOT NULL,
+            properties JSONB,
+            request_id VARCHAR,
+            session_id VARCHAR,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at);
+    """)
+    for offset in range(PARTITION_MONTHS):
+        start = _add_months(PARTITION_ANCHOR, offset)
+        op.execute(
+            f"CREATE TABLE event_logs_y{start.year:04d}m{start.month:02d} PARTITION OF event_logs "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{_add_months(start, 1).isoformat()}')"
+        )
+    # Catches rows outside the pre-created months rather than failing the insert
+    op.execute("CREATE TABLE event_logs_default PARTITION OF event_logs DEFAULT")
+
+    # Event payloads are write-once and rarely read back: lz4 (PG14+) is far
+    # cheaper than the default pglz on insert; older servers, and builds without
+    # lz4, just store large payloads uncompressed. Partitions created later inherit the setting.
+    op.execute("""
+        DO $$
+        BEGIN
+            IF current_setting('server_version_num')::int >= 140000 THEN
+                BEGIN
+                    EXECUTE 'ALTER TABLE event_logs ALTER COLUMN properties SET COMPRESSION lz4';
+                EXCEPTION WHEN feature_not_supported THEN
+                    -- server built without lz4 support
+                    EXECUTE 'ALTER TABLE event_logs ALTER COLUMN properties SET STORAGE EXTERNAL';
+                END;
+            ELSE
+                EXECUTE 'ALTER TABLE event_logs ALTER COLUMN properties SET STORAGE EXTERNAL';
+            END IF;
+        END$$;
+    """)
+
+    # Create indexes (on the parent; Postgres creates them on every partition)
+    # Per-user event lookups filter on user_id + event_name and order by time:
+    # one composite index scan instead of ANDing two single-column bitmaps.
+    # Its user_id prefix also covers user_id-only filters.
+    op.create_index(
+        "ix_event_logs_user_event_created",
+        "event_logs",
+        ["user_id", "event_name", sa.text("created_at DESC")],
+    )
+    # Global time-range scans: the table is append-only in created_at order, so a
+    # BRIN index (a few pages of per-range min/max) does the job of a full btree.
+    op.create_index(
+        "ix_event_logs_created_at_brin",
+        "event_logs",
+        ["created_at"],
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+    op.create_index("ix_event_logs_event_name", "event_logs", ["event_name"])  # admin funnel counts by event only
+    # Property filters (properties @> '{"plan": "free"}'): jsonb_path_ops only
+    # serves containment, which is all we query, and is a fraction of the size
+    # of the default jsonb_ops GIN.
+    op.create_index(
+        "ix_event_logs_properties",
         "event_logs",
-        sa.Column(
-            "id",
-            postgresql.UUID(as_uuid=True),
-            primary_key=True,
-            nullable=False,
-        ),
-        sa.Column(
-            "created_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.func.now(),
-            nullable=False,
-        ),
-        sa.Column(
-            "user_id",
-            postgresql.UUID(as_uuid=True),
-            nullable=True,
-        ),
-        sa.Column("event_name", sa.String(), nullable=False),
-        sa.Column("properties", postgresql.JSONB, nullable=True),
-        sa.Column("request_id", sa.String(), nullable=True),
-        sa.Column("session_id", sa.String(), nullable=True),
+        ["properties"],
+        postgresql_using="gin",
+        postgresql_ops={"properties": "jsonb_path_ops"},
     )
-    # Create indexes
-    op.create_index("ix_event_logs_created_at", "event_logs", ["created_at"])
-    op.create_index("ix_event_logs_event_name", "event_logs", ["event_name"])
-    op.create_index("ix_event_logs_user_id", "event_logs", ["user_id"])
 
 
 def downgrade() -> None:
-    op.drop_index("ix_event_logs_user_id", table_name="event_logs")
+    op.drop_index("ix_event_logs_properties", table_name="event_logs")
     op.drop_index("ix_event_logs_event_name", table_name="event_logs")
-    op.drop_index("ix_event_logs_created_at", table_name="event_logs")
-    op.drop_table("event_logs")
+    op.drop_index("ix_event_logs_created_at_brin", table_name="event_logs")
+    op.drop_index("ix_event_logs_user_event_created", table_name="event_logs")
+    op.drop_table("event_logs")  # drops the partitions with it
 
@@ -7,6 +7,7 @@ Create Date: 2026-01-03
 """
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy import inspect
 from sqlalchemy.dialects import postgresql
 
 
@@ -19,15 +20,9 @@ depends_on = None
 
 def upgrade() -> None:
     # Safety guard: ensure books table exists before creating FK to it
-    op.execute("""
-        DO $$
-        BEGIN
-            IF to_regclass('public.books') IS NULL THEN
-                RAISE EXCEPTION 'books table missing - migration chain is out of order. books table must exist before creating pending_books.';
-            END IF;
-        END
-        $$;
-    """)
+    insp = inspect(op.get_bind())
+    if "books" not in insp.get_table_names():
+        raise RuntimeError("books table missing - migration chain is out of order. books table must exist before creating pending_books.")
 
     op.create_table(
         "pending_books",
@@ -39,8 +34,8 @@ def upgrade() -> None:
         ),
         sa.Column("title", sa.String(), nullable=False),
         sa.Column("author", sa.String(), nullable=False),
-        sa.Column("isbn", sa.String(), nullable=True),
-        sa.Column("isbn13", sa.String(), nullable=True),
+        sa.Column("isbn", sa.CHAR(10), nullable=True),
+        sa.Column("isbn13", sa.CHAR(13), nullable=True),
         sa.Column("goodreads_id", sa.String(), nullable=True),
         sa.Column("goodreads_url", sa.String(), nullable=True),
         sa.Column("year_published", sa.Integer(), nullable=True),
@@ -70,7 +65,24 @@ def upgrade() -> None:
             nullable=True,
         ),
     )
+    # One queue entry per ISBN-13
+    op.create_index(
+        "ix_pending_books_isbn13",
+        "pending_books",
+        ["isbn13"],
+        unique=True,
+        postgresql_where=sa.text("isbn13 IS NOT NULL"),
+    )
+    # Weekly report: books still waiting for the catalog, newest first
+    op.create_index(
+        "ix_pending_books_not_added",
+        "pending_books",
+        ["created_at"],
+        postgresql_where=sa.text("added_to_catalog = false"),
+    )
 
 
 def downgrade() -> None:
+    op.drop_index("ix_pending_books_not_added", table_name="pending_books")
+    op.drop_index("ix_pending_books_isbn13", table_name="pending_books")
     op.drop_table("pending_books")
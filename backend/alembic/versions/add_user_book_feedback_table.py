@@ -20,23 +20,18 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Create enum types for feedback
+    # Create enum types for feedback (one round trip; an existing type is left as-is)
     op.execute("""
         DO $$
         BEGIN
-            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'feedbacksentiment') THEN
+            BEGIN
                 CREATE TYPE feedbacksentiment AS ENUM ('positive', 'negative');
-            END IF;
-        END
-        $$;
-    """)
-    
-    op.execute("""
-        DO $$
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'feedbackstate') THEN
+            EXCEPTION WHEN duplicate_object THEN NULL;
+            END;
+            BEGIN
                 CREATE TYPE feedbackstate AS ENUM ('interested', 'read_completed', 'dismissed');
-            END IF;
+            EXCEPTION WHEN duplicate_object THEN NULL;
+            END;
         END
         $$;
     """)
@@ -53,11 +48,13 @@ def upgrade() -> None:
         sa.Column(
             "user_id",
             postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE", name="fk_ubf_user"),
             nullable=False,
         ),
         sa.Column(
             "book_id",
             postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("books.id", ondelete="CASCADE", name="fk_ubf_book"),
             nullable=False,
         ),
         sa.Column(
@@ -84,16 +81,18 @@ def upgrade() -> None:
         ),
     )
     
-    # Create indexes
-    op.create_index("ix_user_book_feedback_user_id", "user_book_feedback", ["user_id"])
-    op.create_index("ix_user_book_feedback_book_id", "user_book_feedback", ["book_id"])
-    op.create_index("idx_user_book_feedback_user_book", "user_book_feedback", ["user_id", "book_id"])
-
+    # Create indexes (one round trip)
+    # (user_id, book_id) also serves user_id-only lookups; INCLUDE lets
+    # state/sentiment reads be index-only scans.
+    op.execute("""
+        CREATE INDEX ix_user_book_feedback_book_id ON user_book_feedback (book_id);
+        CREATE INDEX idx_user_book_feedback_user_book ON user_book_feedback (user_id, book_id)
+            INCLUDE (state, sentiment);
+    """)
 
 def downgrade() -> None:
     op.drop_index("idx_user_book_feedback_user_book", table_name="user_book_feedback")
     op.drop_index("ix_user_book_feedback_book_id", table_name="user_book_feedback")
-    op.drop_index("ix_user_book_feedback_user_id", table_name="user_book_feedback")
     op.drop_table("user_book_feedback")
     
     # Drop enum types
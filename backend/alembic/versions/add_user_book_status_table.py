@@ -29,9 +29,15 @@ def upgrade() -> None:
         sa.Column(
             "user_id",
             postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE", name="fk_user_book_status_user_id"),
+            nullable=False,
+        ),
+        sa.Column(
+            "book_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("books.id", ondelete="CASCADE", name="fk_user_book_status_book_id"),
             nullable=False,
         ),
-        sa.Column("book_id", sa.String(), nullable=False),
         sa.Column("status", sa.String(), nullable=False),
         sa.Column(
             "created_at",
@@ -47,7 +53,14 @@ def upgrade() -> None:
         ),
     )
     # Create indexes
-    op.create_index("ix_user_book_status_user_id", "user_book_status", ["user_id"])
+    # user_id lookups use the leftmost column of uq_user_book_status_user_book;
+    # the active shelves (interested / currently_reading) get a small partial index.
+    op.create_index(
+        "ix_user_book_status_active",
+        "user_book_status",
+        ["user_id", sa.text("updated_at DESC")],
+        postgresql_where=sa.text("status IN ('interested', 'currently_reading')"),
+    )
     op.create_index("ix_user_book_status_book_id", "user_book_status", ["book_id"])
     # Create unique constraint
     op.create_unique_constraint(
@@ -60,6 +73,6 @@ def upgrade() -> None:
 def downgrade() -> None:
     op.drop_constraint("uq_user_book_status_user_book", "user_book_status", type_="unique")
     op.drop_index("ix_user_book_status_book_id", table_name="user_book_status")
-    op.drop_index("ix_user_book_status_user_id", table_name="user_book_status")
+    op.drop_index("ix_user_book_status_active", table_name="user_book_status")
     op.drop_table("user_book_status")
 
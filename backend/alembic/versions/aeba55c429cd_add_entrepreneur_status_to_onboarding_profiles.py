@@ -6,7 +6,6 @@ Create Date: 2025-12-10
 
 """
 from alembic import op
-import sqlalchemy as sa
 
 
 # revision identifiers, used by Alembic.
@@ -17,12 +16,8 @@ depends_on = None
 
 
 def upgrade() -> None:
-    op.add_column(
-        "onboarding_profiles",
-        sa.Column("entrepreneur_status", sa.String(), nullable=True)
-    )
+    op.execute("ALTER TABLE onboarding_profiles ADD COLUMN IF NOT EXISTS entrepreneur_status VARCHAR")
 
 
 def downgrade() -> None:
-    op.drop_column("onboarding_profiles", "entrepreneur_status")
-
+    op.execute("ALTER TABLE onboarding_profiles DROP COLUMN IF EXISTS entrepreneur_status")
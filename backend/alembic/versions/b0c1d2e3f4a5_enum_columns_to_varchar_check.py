@@ -0,0 +1,68 @@
+"""store subscription_status and business_stage as VARCHAR + CHECK
+
+Revision ID: b0c1d2e3f4a5
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-17
+
+users.subscription_status and onboarding_profiles.business_stage move off the
+native subscriptionstatus / businessstage enum types onto VARCHAR(32) with a
+CHECK constraint (the models use a non-native Enum). Adding a value later is a
+constraint swap instead of ALTER TYPE ... ADD VALUE, which can't be used in
+the transaction that adds it. The type change rewrites each table once under
+an exclusive lock; the CHECK is added NOT VALID and validated separately.
+"""
+from alembic import op
+
+
+revision: str = "b0c1d2e3f4a5"
+down_revision: str = "a9b0c1d2e3f4"
+branch_labels = None
+depends_on = None
+
+# (table, column, enum type, check constraint, allowed values, server default)
+COLUMNS = (
+    ("users", "subscription_status", "subscriptionstatus", "ck_users_subscription_status",
+     ("free", "active", "canceled"), "free"),
+    ("onboarding_profiles", "business_stage", "businessstage", "ck_onboarding_profiles_business_stage",
+     ("idea", "pre-revenue", "early-revenue", "scaling"), None),
+)
+
+
+def _values(values) -> str:
+    return ", ".join(f"'{v}'" for v in values)
+
+
+def upgrade() -> None:
+    for table, column, type_name, check, values, default in COLUMNS:
+        # The enum-typed default can't be cast along with the column: drop it, re-set it after
+        set_default = f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}';" if default else ""
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = '{table}' AND column_name = '{column}' AND udt_name = '{type_name}'
+                ) THEN
+                    ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT;
+                    ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(32) USING {column}::text;
+                    {set_default}
+                END IF;
+
+                IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{check}') THEN
+                    ALTER TABLE {table}
+                        ADD CONSTRAINT {check} CHECK ({column} IN ({_values(values)})) NOT VALID;
+                END IF;
+            END$$;
+        """)
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {check}")
+        op.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+
+def downgrade() -> None:
+    for table, column, type_name, check, values, default in COLUMNS:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {check}")
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({_values(values)})")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}")
+        if default:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'")
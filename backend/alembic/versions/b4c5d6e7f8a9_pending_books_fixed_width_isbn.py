@@ -0,0 +1,68 @@
+"""fixed-width pending_books ISBN columns and partial indexes
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-17
+
+add_pending_books_table now creates these for fresh databases; this brings
+existing databases in line. ISBNs of the wrong length cannot be valid and
+would not fit the new types, so they are cleared; rows repeating an ISBN-13
+are deleted, keeping the newest, so the unique index can be built.
+"""
+from alembic import op
+
+
+revision: str = "b4c5d6e7f8a9"
+down_revision: str = "a3b4c5d6e7f8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'pending_books' AND column_name = 'isbn13' AND data_type <> 'character'
+            ) THEN
+                ALTER TABLE pending_books
+                    ALTER COLUMN isbn TYPE CHAR(10)
+                        USING CASE WHEN length(isbn) = 10 THEN isbn END,
+                    ALTER COLUMN isbn13 TYPE CHAR(13)
+                        USING CASE WHEN length(isbn13) = 13 THEN isbn13 END;
+            END IF;
+        END$$;
+    """)
+    # The unique index can't build over duplicate ISBN-13s: keep the newest row of each
+    op.execute("""
+        DELETE FROM pending_books p
+        USING (
+            SELECT id, row_number() OVER (PARTITION BY isbn13 ORDER BY created_at DESC, id DESC) AS rn
+            FROM pending_books
+            WHERE isbn13 IS NOT NULL
+        ) ranked
+        WHERE p.id = ranked.id AND ranked.rn > 1
+    """)
+    with op.get_context().autocommit_block():
+        # A failed CONCURRENTLY build leaves an INVALID index behind under this name
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_pending_books_isbn13")
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_pending_books_isbn13
+            ON pending_books (isbn13) WHERE isbn13 IS NOT NULL
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pending_books_not_added
+            ON pending_books (created_at) WHERE added_to_catalog = false
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_pending_books_not_added")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_pending_books_isbn13")
+    op.execute("""
+        ALTER TABLE pending_books
+            ALTER COLUMN isbn TYPE VARCHAR USING rtrim(isbn),
+            ALTER COLUMN isbn13 TYPE VARCHAR USING rtrim(isbn13)
+    """)
@@ -0,0 +1,44 @@
+"""convert users.email to citext
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-17
+
+2b3c4d5e6f7a now makes users.email CITEXT for fresh databases; this brings
+existing databases in line and drops the LOWER(email) functional index they
+were given, which CITEXT equality no longer uses.
+"""
+from alembic import op
+
+
+revision: str = "b8c9d0e1f2a3"
+down_revision: str = "a7b8c9d0e1f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'users' AND column_name = 'email' AND udt_name <> 'citext'
+            ) THEN
+                ALTER TABLE users ALTER COLUMN email TYPE CITEXT;
+            END IF;
+        END$$;
+    """)
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_lower_unique")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE users ALTER COLUMN email TYPE VARCHAR")
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_lower_unique
+            ON users (LOWER(email))
+            WHERE email IS NOT NULL
+        """)
@@ -0,0 +1,66 @@
+"""convert reading_history_entries.date_read to DATE
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-17
+
+ee4e43888fe6 now creates date_read as DATE for fresh databases; this
+converts existing databases. Goodreads writes YYYY/MM/DD; values are parsed
+like parse_date_read, and anything that isn't a valid date in one of its
+formats becomes NULL instead of failing the migration.
+"""
+from alembic import op
+
+
+revision: str = "c5d6e7f8a9b0"
+down_revision: str = "b4c5d6e7f8a9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Same formats as parse_date_read (YYYY/MM/DD, YYYY-MM-DD, MM/DD/YYYY).
+    # make_date rejects impossible dates (2023/02/30, 2024-13-01); those and
+    # anything unrecognised become NULL. pg_temp: gone when the session ends.
+    op.execute(r"""
+        CREATE FUNCTION pg_temp.readar_parse_date_read(v text) RETURNS date
+        LANGUAGE plpgsql IMMUTABLE AS $f$
+        DECLARE
+            parts text[];
+        BEGIN
+            v := btrim(v);
+            parts := regexp_match(v, '^(\d{4})([/-])(\d{1,2})\2(\d{1,2})$');
+            IF parts IS NOT NULL THEN
+                RETURN make_date(parts[1]::int, parts[3]::int, parts[4]::int);
+            END IF;
+            parts := regexp_match(v, '^(\d{1,2})/(\d{1,2})/(\d{4})$');
+            IF parts IS NOT NULL THEN
+                RETURN make_date(parts[3]::int, parts[1]::int, parts[2]::int);
+            END IF;
+            RETURN NULL;
+        EXCEPTION WHEN invalid_datetime_format OR datetime_field_overflow THEN
+            RETURN NULL;
+        END
+        $f$
+    """)
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'reading_history_entries' AND column_name = 'date_read' AND data_type <> 'date'
+            ) THEN
+                ALTER TABLE reading_history_entries
+                    ALTER COLUMN date_read TYPE DATE
+                    USING pg_temp.readar_parse_date_read(date_read);
+            END IF;
+        END$$;
+    """)
+    op.execute("DROP FUNCTION pg_temp.readar_parse_date_read(text)")
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE reading_history_entries
+            ALTER COLUMN date_read TYPE VARCHAR USING to_char(date_read, 'YYYY/MM/DD')
+    """)
@@ -0,0 +1,46 @@
+"""replace event_logs user_id index with a (user_id, event_name, created_at) composite
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-17
+
+add_event_logs_table now creates the composite for fresh databases; this
+brings existing databases in line. Built and dropped CONCURRENTLY so event
+writes keep flowing during the deploy.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c9d0e1f2a3b4"
+down_revision: str = "b8c9d0e1f2a3"
+branch_labels = None
+depends_on = None
+
+
+def _is_partitioned() -> bool:
+    # Partitioned event_logs (fresh databases) already carry this index from
+    # add_event_logs_table, and CONCURRENTLY is not allowed on them.
+    return op.get_bind().execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'event_logs'::regclass)"
+    )).scalar()
+
+
+def upgrade() -> None:
+    if _is_partitioned():
+        return
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_event_logs_user_event_created
+            ON event_logs (user_id, event_name, created_at DESC)
+        """)
+        # Leftmost prefix of the composite
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_event_logs_user_id")
+
+
+def downgrade() -> None:
+    if _is_partitioned():
+        return
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_event_logs_user_id ON event_logs (user_id)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_event_logs_user_event_created")
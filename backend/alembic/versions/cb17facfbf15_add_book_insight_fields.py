@@ -8,8 +8,6 @@ Create Date: 2025-12-15 12:16:05.499701
 from typing import Sequence, Union
 
 from alembic import op
-import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -20,19 +18,24 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Add insight fields to books table
-    op.add_column('books', sa.Column('promise', sa.Text(), nullable=True))
-    op.add_column('books', sa.Column('best_for', sa.Text(), nullable=True))
-    op.add_column('books', sa.Column('core_frameworks', postgresql.JSONB(), nullable=True))
-    op.add_column('books', sa.Column('anti_patterns', postgresql.JSONB(), nullable=True))
-    op.add_column('books', sa.Column('outcomes', postgresql.JSONB(), nullable=True))
+    # Add insight fields to books table (one ALTER: one lock, one catalog update)
+    op.execute("""
+        ALTER TABLE books
+            ADD COLUMN promise TEXT,
+            ADD COLUMN best_for TEXT,
+            ADD COLUMN core_frameworks JSONB,
+            ADD COLUMN anti_patterns JSONB,
+            ADD COLUMN outcomes JSONB
+    """)
 
 
 def downgrade() -> None:
     # Remove insight fields from books table
-    op.drop_column('books', 'outcomes')
-    op.drop_column('books', 'anti_patterns')
-    op.drop_column('books', 'core_frameworks')
-    op.drop_column('books', 'best_for')
-    op.drop_column('books', 'promise')
-
+    op.execute("""
+        ALTER TABLE books
+            DROP COLUMN outcomes,
+            DROP COLUMN anti_patterns,
+            DROP COLUMN core_frameworks,
+            DROP COLUMN best_for,
+            DROP COLUMN promise
+    """)
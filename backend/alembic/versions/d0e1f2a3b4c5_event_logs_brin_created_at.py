@@ -0,0 +1,44 @@
+"""replace event_logs created_at btree with a BRIN index
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-17
+
+add_event_logs_table now creates the BRIN index for fresh databases; this
+brings existing databases in line.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d0e1f2a3b4c5"
+down_revision: str = "c9d0e1f2a3b4"
+branch_labels = None
+depends_on = None
+
+
+def _is_partitioned() -> bool:
+    # Partitioned event_logs (fresh databases) already carry this index from
+    # add_event_logs_table, and CONCURRENTLY is not allowed on them.
+    return op.get_bind().execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'event_logs'::regclass)"
+    )).scalar()
+
+
+def upgrade() -> None:
+    if _is_partitioned():
+        return
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_event_logs_created_at_brin
+            ON event_logs USING BRIN (created_at) WITH (pages_per_range = 32)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_event_logs_created_at")
+
+
+def downgrade() -> None:
+    if _is_partitioned():
+        return
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_event_logs_created_at ON event_logs (created_at)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_event_logs_created_at_brin")
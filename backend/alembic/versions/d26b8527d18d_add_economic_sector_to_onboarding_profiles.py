@@ -7,7 +7,6 @@ Create Date: 2025-12-10
 """
 from typing import Sequence, Union
 from alembic import op
-import sqlalchemy as sa
 
 
 # revision identifiers, used by Alembic.
@@ -18,12 +17,8 @@ depends_on = None
 
 
 def upgrade() -> None:
-    op.add_column(
-        "onboarding_profiles",
-        sa.Column("economic_sector", sa.String(), nullable=True)
-    )
+    op.execute("ALTER TABLE onboarding_profiles ADD COLUMN IF NOT EXISTS economic_sector VARCHAR")
 
 
 def downgrade() -> None:
-    op.drop_column("onboarding_profiles", "economic_sector")
-
+    op.execute("ALTER TABLE onboarding_profiles DROP COLUMN IF EXISTS economic_sector")
@@ -0,0 +1,67 @@
+"""make user_book_status.book_id a UUID foreign key to books
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-17
+
+add_user_book_status_table / ensure_user_book_status_table now create
+book_id as a UUID FK for fresh databases; this converts existing databases.
+Rows that used a book's external_id are repointed at its UUID (dropping any
+that would duplicate a UUID row for the same user), rows that still don't
+resolve to a catalog book are deleted, then the column is retyped. The FK is
+added NOT VALID and validated separately so validation doesn't block writes.
+"""
+from alembic import op
+
+
+revision: str = "d6e7f8a9b0c1"
+down_revision: str = "c5d6e7f8a9b0"
+branch_labels = None
+depends_on = None
+
+UUID_RE = "^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+
+
+def upgrade() -> None:
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'user_book_status' AND column_name = 'book_id' AND data_type <> 'uuid'
+            ) THEN
+                DELETE FROM user_book_status s
+                USING books b, user_book_status t
+                WHERE s.book_id !~ '{UUID_RE}'
+                  AND b.external_id = s.book_id
+                  AND t.user_id = s.user_id
+                  AND t.book_id = b.id::text;
+
+                UPDATE user_book_status s
+                SET book_id = b.id::text
+                FROM books b
+                WHERE s.book_id !~ '{UUID_RE}' AND b.external_id = s.book_id;
+
+                DELETE FROM user_book_status WHERE book_id !~ '{UUID_RE}';
+
+                ALTER TABLE user_book_status ALTER COLUMN book_id TYPE UUID USING book_id::uuid;
+            END IF;
+
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conname = 'fk_user_book_status_book_id'
+            ) THEN
+                DELETE FROM user_book_status s
+                WHERE NOT EXISTS (SELECT 1 FROM books b WHERE b.id = s.book_id);
+
+                ALTER TABLE user_book_status
+                    ADD CONSTRAINT fk_user_book_status_book_id
+                    FOREIGN KEY (book_id) REFERENCES books (id) ON DELETE CASCADE NOT VALID;
+            END IF;
+        END$$;
+    """)
+    op.execute("ALTER TABLE user_book_status VALIDATE CONSTRAINT fk_user_book_status_book_id")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE user_book_status DROP CONSTRAINT IF EXISTS fk_user_book_status_book_id")
+    op.execute("ALTER TABLE user_book_status ALTER COLUMN book_id TYPE VARCHAR USING book_id::text")
@@ -0,0 +1,122 @@
+"""partition event_logs by month
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-17
+
+add_event_logs_table now creates event_logs partitioned for fresh databases;
+this converts existing databases. The old table is kept and attached as the
+partition for everything before PARTITION_ANCHOR, or before the month after
+its newest row if that is later (the ATTACH scans it once to validate the
+range); its PRIMARY KEY (id) is replaced by (id, created_at) first, since the
+partition key must be part of it. The remaining monthly partitions from the
+anchor plus a DEFAULT partition are then created. The swap runs in the
+migration transaction, so event writes wait for it.
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e1f2a3b4c5d6"
+down_revision: str = "d0e1f2a3b4c5"
+branch_labels = None
+depends_on = None
+
+# Same fixed anchor as add_event_logs_table: the schema doesn't depend on the run date
+PARTITION_ANCHOR = date(2026, 10, 1)
+PARTITION_MONTHS = 12
+
+EVENT_LOG_INDEXES = (
+    "ix_event_logs_user_event_created",
+    "ix_event_logs_created_at_brin",
+    "ix_event_logs_event_name",
+)
+
+
+def _add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def _is_partitioned() -> bool:
+    return op.get_bind().execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'event_logs'::regclass)"
+    )).scalar()
+
+
+def _create_indexes() -> None:
+    op.create_index(
+        "ix_event_logs_user_event_created",
+        "event_logs",
+        ["user_id", "event_name", sa.text("created_at DESC")],
+    )
+    op.create_index(
+        "ix_event_logs_created_at_brin",
+        "event_logs",
+        ["created_at"],
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+    op.create_index("ix_event_logs_event_name", "event_logs", ["event_name"])
+
+
+def upgrade() -> None:
+    if _is_partitioned():
+        return
+
+    # Free the names the partitioned parent will use
+    op.execute("ALTER TABLE event_logs RENAME TO event_logs_legacy")
+    # A partition can't keep PRIMARY KEY (id): swap it for the parent's (id, created_at)
+    op.execute("""
+        ALTER TABLE event_logs_legacy
+            DROP CONSTRAINT event_logs_pkey,
+            ADD CONSTRAINT event_logs_legacy_pkey PRIMARY KEY (id, created_at)
+    """)
+    for name in EVENT_LOG_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute("""
+        CREATE TABLE event_logs (
+            id UUID NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            user_id UUID,
+            event_name VARCHAR NOT NULL,
+            properties JSONB,
+            request_id VARCHAR,
+            session_id VARCHAR,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+
+    # The legacy partition must hold every existing row
+    latest = op.get_bind().execute(sa.text("SELECT max(created_at) FROM event_logs_legacy")).scalar()
+    first = PARTITION_ANCHOR
+    if latest is not None:
+        first = max(first, _add_months(latest.date().replace(day=1), 1))
+    op.execute(
+        f"ALTER TABLE event_logs ATTACH PARTITION event_logs_legacy "
+        f"FOR VALUES FROM (MINVALUE) TO ('{first.isoformat()}')"
+    )
+    for offset in range(PARTITION_MONTHS):
+        start = _add_months(PARTITION_ANCHOR, offset)
+        if start < first:
+            continue
+        op.execute(
+            f"CREATE TABLE event_logs_y{start.year:04d}m{start.month:02d} PARTITION OF event_logs "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{_add_months(start, 1).isoformat()}')"
+        )
+    op.execute("CREATE TABLE event_logs_default PARTITION OF event_logs DEFAULT")
+
+    _create_indexes()
+
+
+def downgrade() -> None:
+    # Back to a single unpartitioned table holding every row
+    op.execute("CREATE TABLE event_logs_flat (LIKE event_logs INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO event_logs_flat SELECT * FROM event_logs")
+    op.execute("DROP TABLE event_logs")
+    op.execute("ALTER TABLE event_logs_flat RENAME TO event_logs")
+    op.execute("ALTER TABLE event_logs ADD PRIMARY KEY (id)")
+    _create_indexes()
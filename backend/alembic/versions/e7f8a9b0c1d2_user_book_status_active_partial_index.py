@@ -0,0 +1,34 @@
+"""partial index for active user_book_status shelves
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-17
+
+add_user_book_status_table / ensure_user_book_status_table now create this
+for fresh databases; this brings existing databases in line, CONCURRENTLY.
+"""
+from alembic import op
+
+
+revision: str = "e7f8a9b0c1d2"
+down_revision: str = "d6e7f8a9b0c1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_book_status_active
+            ON user_book_status (user_id, updated_at DESC)
+            WHERE status IN ('interested', 'currently_reading')
+        """)
+        # Leftmost prefix of uq_user_book_status_user_book
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_book_status_user_id")
+
+
+def downgrade() -> None:
+    # ix_user_book_status_active is part of the table's base schema now; the
+    # create-table migrations drop it on their own downgrade.
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_book_status_user_id ON user_book_status (user_id)")
@@ -7,6 +7,7 @@ Create Date: 2025-12-10
 """
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy import inspect
 from sqlalchemy.dialects import postgresql
 
 
@@ -19,16 +20,10 @@ depends_on = None
 
 def upgrade() -> None:
     # Safety guard: ensure users table exists before creating FK to it
-    op.execute("""
-        DO $$
-        BEGIN
-            IF to_regclass('public.users') IS NULL THEN
-                RAISE EXCEPTION 'users table missing - migration chain is out of order. users table must exist before creating reading_history_entries.';
-            END IF;
-        END
-        $$;
-    """)
-    
+    insp = inspect(op.get_bind())
+    if "users" not in insp.get_table_names():
+        raise RuntimeError("users table missing - migration chain is out of order. users table must exist before creating reading_history_entries.")
+
     op.create_table(
         "reading_history_entries",
         sa.Column(
@@ -46,7 +41,7 @@ def upgrade() -> None:
         sa.Column("title", sa.String(), nullable=False),
         sa.Column("author", sa.String(), nullable=True),
         sa.Column("my_rating", sa.Float(), nullable=True),
-        sa.Column("date_read", sa.String(), nullable=True),
+        sa.Column("date_read", sa.Date(), nullable=True),
         sa.Column("shelf", sa.String(), nullable=True),
         sa.Column(
             "source",
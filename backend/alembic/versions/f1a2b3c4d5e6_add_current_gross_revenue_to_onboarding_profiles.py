@@ -4,9 +4,10 @@ Revision ID: f1a2b3c4d5e6
 Revises: 000000000000
 Create Date: 2025-01-15
 
+Nullable without a default, so no table rewrite. IF NOT EXISTS keeps it
+safe on databases that already have the column.
 """
 from alembic import op
-import sqlalchemy as sa
 
 
 # revision identifiers, used by Alembic.
@@ -17,12 +18,8 @@ depends_on = None
 
 
 def upgrade() -> None:
-    op.add_column(
-        "onboarding_profiles",
-        sa.Column("current_gross_revenue", sa.String(), nullable=True)
-    )
+    op.execute("ALTER TABLE onboarding_profiles ADD COLUMN IF NOT EXISTS current_gross_revenue VARCHAR")
 
 
 def downgrade() -> None:
-    op.drop_column("onboarding_profiles", "current_gross_revenue")
-
+    op.execute("ALTER TABLE onboarding_profiles DROP COLUMN IF EXISTS current_gross_revenue")
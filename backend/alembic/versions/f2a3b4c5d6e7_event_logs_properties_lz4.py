@@ -0,0 +1,47 @@
+"""compress event_logs.properties with lz4
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-17
+
+add_event_logs_table now sets this for fresh databases; this brings existing
+databases in line. Only newly written values are affected, so there is no
+table rewrite.
+"""
+from alembic import op
+
+
+revision: str = "f2a3b4c5d6e7"
+down_revision: str = "e1f2a3b4c5d6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$
+        BEGIN
+            IF current_setting('server_version_num')::int >= 140000 THEN
+                BEGIN
+                    EXECUTE 'ALTER TABLE event_logs ALTER COLUMN properties SET COMPRESSION lz4';
+                EXCEPTION WHEN feature_not_supported THEN
+                    -- server built without lz4 support
+                    EXECUTE 'ALTER TABLE event_logs ALTER COLUMN properties SET STORAGE EXTERNAL';
+                END;
+            ELSE
+                EXECUTE 'ALTER TABLE event_logs ALTER COLUMN properties SET STORAGE EXTERNAL';
+            END IF;
+        END$$;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DO $$
+        BEGIN
+            IF current_setting('server_version_num')::int >= 140000 THEN
+                EXECUTE 'ALTER TABLE event_logs ALTER COLUMN properties SET COMPRESSION DEFAULT';
+            END IF;
+        END$$;
+    """)
+    op.execute("ALTER TABLE event_logs ALTER COLUMN properties SET STORAGE EXTENDED")
@@ -0,0 +1,49 @@
+"""add a jsonb_path_ops GIN index on event_logs.properties
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-17
+
+add_event_logs_table now creates the index for fresh databases; this brings
+existing databases in line. event_logs is partitioned by now, and CREATE
+INDEX CONCURRENTLY is not allowed on a partitioned parent, so the parent
+index is created ON ONLY (catalog-only, invalid), each partition is indexed
+CONCURRENTLY and attached, and the parent turns valid once every partition
+is attached. Partitions created later get the index automatically.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f8a9b0c1d2e3"
+down_revision: str = "e7f8a9b0c1d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.execute(sa.text("SELECT to_regclass('ix_event_logs_properties') IS NOT NULL")).scalar():
+        return
+
+    partitions = conn.execute(sa.text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'event_logs'::regclass ORDER BY c.relname"
+    )).scalars().all()
+
+    op.execute(
+        "CREATE INDEX ix_event_logs_properties ON ONLY event_logs "
+        "USING GIN (properties jsonb_path_ops)"
+    )
+    with op.get_context().autocommit_block():
+        for name in partitions:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name}_properties_idx "
+                f"ON {name} USING GIN (properties jsonb_path_ops)"
+            )
+            op.execute(f"ALTER INDEX ix_event_logs_properties ATTACH PARTITION {name}_properties_idx")
+
+
+def downgrade() -> None:
+    # Dropping the parent index drops the attached partition indexes with it
+    op.execute("DROP INDEX IF EXISTS ix_event_logs_properties")
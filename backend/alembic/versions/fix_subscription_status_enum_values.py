@@ -16,7 +16,6 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -25,48 +24,48 @@ down_revision: Union[str, None] = '3b9a0a068da5'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+BATCH_SIZE = 30_000
+
 
 def upgrade() -> None:
     # Step 1: Update any NULL values to 'free' (the default)
-    op.execute("""
-        UPDATE users
-        SET subscription_status = 'free'
-        WHERE subscription_status IS NULL;
-    """)
+    # In autocommit, BATCH_SIZE rows per statement, so each batch commits and
+    # releases its row locks. A transient partial index over just the NULL rows
+    # keeps each batch from seq-scanning users: cost tracks the NULL count.
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_null_subscription_status
+            ON users (id) WHERE subscription_status IS NULL;
+        """)
+        batch = sa.text("""
+            UPDATE users
+            SET subscription_status = 'free'
+            WHERE id IN (
+                SELECT id FROM users
+                WHERE subscription_status IS NULL
+                ORDER BY id
+                LIMIT :batch_size
+            );
+        """)
+        conn = op.get_bind()
+        while conn.execute(batch, {"batch_size": BATCH_SIZE}).rowcount:
+            pass
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_null_subscription_status;")
     
-    # Step 2: Set server_default to 'free'
-    # First, drop the existing default if any (though there may not be one)
+    # Steps 2-3: Set server_default to 'free' and nullable=False in one
+    # ALTER TABLE (one exclusive lock on users). SET DEFAULT replaces any
+    # existing default, so no DROP DEFAULT first.
     op.execute("""
         ALTER TABLE users
-        ALTER COLUMN subscription_status DROP DEFAULT;
+        ALTER COLUMN subscription_status SET DEFAULT 'free',
+        ALTER COLUMN subscription_status SET NOT NULL;
     """)
-    
-    # Then set the new default
-    op.execute("""
-        ALTER TABLE users
-        ALTER COLUMN subscription_status SET DEFAULT 'free';
-    """)
-    
-    # Step 3: Set nullable=False
-    op.alter_column(
-        'users',
-        'subscription_status',
-        nullable=False,
-        existing_type=postgresql.ENUM('free', 'active', 'canceled', name='subscriptionstatus', create_type=False),
-    )
 
 
 def downgrade() -> None:
     # Revert to nullable=True and remove default
-    op.alter_column(
-        'users',
-        'subscription_status',
-        nullable=True,
-        existing_type=postgresql.ENUM('free', 'active', 'canceled', name='subscriptionstatus', create_type=False),
-    )
-    
     op.execute("""
         ALTER TABLE users
+        ALTER COLUMN subscription_status DROP NOT NULL,
         ALTER COLUMN subscription_status DROP DEFAULT;
     """)
-
@@ -4,21 +4,46 @@ Authentication helpers for verifying Supabase JWTs and resolving the current app
 
 from __future__ import annotations
 
+import hashlib
 import logging
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 
 from fastapi import Depends, HTTPException, Request, status
-from jose import JWTError, jwt
+from jose import JWTError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.jwt_hs256 import HS256Verifier
 from app.database import get_db
 from app.models import User
 from app.core.user_helpers import get_or_create_user_by_auth_id
-from app.core.admin import parse_admin_allowlist, is_admin_email
+from app.core.admin import is_admin_email
 
 logger = logging.getLogger(__name__)
 
+# Token verifier, built on the first decode once require_supabase() has passed
+# (settings don't change at runtime): HMAC key schedule plus expected aud/iss.
+_verifier: Optional[HS256Verifier] = None
+
+# Recently verified tokens: blake2b(token) -> (expires_at, payload, user_id).
+# Repeat requests with the same bearer token skip the JWT verify and, once
+# get_current_user has resolved it (user_id not None), the user upsert. Entries live at most TOKEN_CACHE_TTL seconds and never past the
+# token's own exp; the oldest are evicted beyond TOKEN_CACHE_MAX entries.
+TOKEN_CACHE_TTL = 60.0
+TOKEN_CACHE_MAX = 4096
+_token_cache: OrderedDict[bytes, Tuple[float, Dict[str, Any], Any]] = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+# Recently rejected tokens: blake2b(token) -> expires_at. A client retrying an
+# expired or bad token gets its 401 without another HMAC verify (or log line)
+# for BAD_TOKEN_CACHE_TTL seconds; kept short so nothing valid is held off.
+BAD_TOKEN_CACHE_TTL = 5.0
+BAD_TOKEN_CACHE_MAX = 2048
+_bad_token_cache: OrderedDict[bytes, float] = OrderedDict()
+
 
 def _unauthorized(detail: str = "Not authenticated") -> HTTPException:
     return HTTPException(
@@ -36,56 +61,103 @@ def _extract_bearer_token(request: Request) -> str:
     if not auth:
         raise _unauthorized("Missing Authorization header")
 
-    parts = auth.split()
-    if len(parts) != 2:
-        raise _unauthorized("Invalid Authorization header format. Expected 'Bearer <token>'")
-
-    scheme, token = parts
-    if scheme.lower() != "bearer":
+    # Prefix check + slice: no split() list on the (common) well-formed path
+    if auth[:7].lower() != "bearer ":
+        if " " not in auth.strip():
+            raise _unauthorized("Invalid Authorization header format. Expected 'Bearer <token>'")
         raise _unauthorized("Invalid auth scheme. Expected 'Bearer'")
 
-    if not token.strip():
+    token = auth[7:].strip()
+    if not token:
         raise _unauthorized("Empty bearer token")
 
     return token
 
 
-def _decode_supabase_jwt(token: str) -> Dict[str, Any]:
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _cached_auth(key: bytes) -> Optional[Tuple[Dict[str, Any], Any]]:
+    """Return (payload, user_id) for a still-valid cached token, else None."""
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del _token_cache[key]
+            return None
+        _token_cache.move_to_end(key)
+        return entry[1], entry[2]
+
+
+def _remember_auth(key: bytes, payload: Dict[str, Any], user_id: Any) -> None:
+    now = time.time()
+    expires_at = now + TOKEN_CACHE_TTL
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, exp)
+    if expires_at <= now:
+        return
+    with _token_cache_lock:
+        _token_cache[key] = (expires_at, payload, user_id)
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > TOKEN_CACHE_MAX:
+            _token_cache.popitem(last=False)
+
+
+def _recently_rejected(key: bytes) -> bool:
+    with _token_cache_lock:
+        expires_at = _bad_token_cache.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del _bad_token_cache[key]
+            return False
+        return True
+
+
+def _remember_rejection(key: bytes) -> None:
+    with _token_cache_lock:
+        _bad_token_cache[key] = time.time() + BAD_TOKEN_CACHE_TTL
+        _bad_token_cache.move_to_end(key)
+        while len(_bad_token_cache) > BAD_TOKEN_CACHE_MAX:
+            _bad_token_cache.popitem(last=False)
+
+
+def _init_jwt_context() -> None:
+    global _verifier
+    # Audience and issuer are only validated if explicitly configured (not empty/None)
+    audience = settings.SUPABASE_JWT_AUD if settings.SUPABASE_JWT_AUD and settings.SUPABASE_JWT_AUD.strip() else None
+    issuer = settings.SUPABASE_JWT_ISS if settings.SUPABASE_JWT_ISS and settings.SUPABASE_JWT_ISS.strip() else None
+    _verifier = HS256Verifier(settings.SUPABASE_JWT_SECRET, audience=audience, issuer=issuer)
+
+
+def _decode_supabase_jwt(token: str, cache_key: bytes) -> Dict[str, Any]:
     """
     Decode and validate Supabase access token.
 
     Assumes HS256 using SUPABASE_JWT_SECRET (common for Supabase projects).
-    Validates issuer and audience (if configured).
+    Validates issuer and audience (if configured) and requires sub and exp,
+    all in one pass.
     """
-    # Check Supabase configuration before attempting to decode
-    try:
-        settings.require_supabase()
-    except RuntimeError as e:
-        logger.error(f"Supabase configuration missing: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Supabase environment variables not configured. Authentication is not available.",
-        )
-
-    # Build decode options - make audience and issuer optional if not configured
-    decode_options = {
-        "algorithms": ["HS256"],
-    }
-
-    # Only validate audience if explicitly configured (not empty/None)
-    if settings.SUPABASE_JWT_AUD and settings.SUPABASE_JWT_AUD.strip():
-        decode_options["audience"] = settings.SUPABASE_JWT_AUD
+    # Check Supabase configuration before attempting to decode (first call only)
+    if _verifier is None:
+        try:
+            settings.require_supabase()
+        except RuntimeError as e:
+            logger.error(f"Supabase configuration missing: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Supabase environment variables not configured. Authentication is not available.",
+            )
+        _init_jwt_context()
 
-    # Only validate issuer if explicitly configured (not empty/None)
-    if settings.SUPABASE_JWT_ISS and settings.SUPABASE_JWT_ISS.strip():
-        decode_options["issuer"] = settings.SUPABASE_JWT_ISS
+    if _recently_rejected(cache_key):
+        raise _unauthorized("Token validation failed")
 
     try:
-        payload = jwt.decode(
-            token,
-            settings.SUPABASE_JWT_SECRET,
-            **decode_options
-        )
+        payload = _verifier.decode(token)
 
         # Enhanced logging for successful decode (only in DEBUG mode)
         if logger.isEnabledFor(logging.DEBUG):
@@ -98,6 +170,7 @@ def _decode_supabase_jwt(token: str) -> Dict[str, Any]:
 
         return payload
     except JWTError as e:
+        _remember_rejection(cache_key)
         # Enhanced error logging with more context
         logger.warning(
             f"JWT validation failed: {e} | "
@@ -107,6 +180,34 @@ def _decode_supabase_jwt(token: str) -> Dict[str, Any]:
         raise _unauthorized("Token validation failed")
 
 
+def get_supabase_user(request: Request) -> Dict[str, Any]:
+    """
+    FastAPI dependency: the verified Supabase identity, without touching the users table.
+
+    Same local HS256 verification as get_current_user (no network call);
+    returns {"id", "email", "auth_user_id", "claims"} from the token.
+    Verified payloads are shared with get_current_user through _token_cache.
+    """
+    token = _extract_bearer_token(request)
+    cache_key = _token_key(token)
+    cached = _cached_auth(cache_key)
+    if cached is not None:
+        payload = cached[0]
+    else:
+        payload = _decode_supabase_jwt(token, cache_key)
+
+    user_id = payload["sub"]  # presence enforced by the verifier
+    if cached is None:
+        _remember_auth(cache_key, payload, None)
+
+    return {
+        "id": user_id,
+        "email": payload.get("email", "") or "",
+        "auth_user_id": user_id,
+        "claims": payload,
+    }
+
+
 def get_current_user(
     request: Request,
     db: Session = Depends(get_db),
@@ -119,13 +220,24 @@ def get_current_user(
     - Extracts sub (Supabase user id) and email
     - Upserts into local users table via get_or_create_user_by_auth_id()
     - Stores JWT payload in request.state for downstream use
+
+    A token verified within the last TOKEN_CACHE_TTL seconds is served from
+    _token_cache with a primary-key lookup instead of decode + upsert.
     """
     token = _extract_bearer_token(request)
-    payload = _decode_supabase_jwt(token)
+    cache_key = _token_key(token)
+    cached = _cached_auth(cache_key)
+    if cached is not None and cached[1] is not None:
+        payload, user_id = cached
+        user = db.get(User, user_id)
+        if user is not None:
+            request.state.supabase_jwt_payload = payload
+            return user
+
+    # A payload cached by get_supabase_user is already verified
+    payload = cached[0] if cached is not None else _decode_supabase_jwt(token, cache_key)
 
-    auth_user_id = payload.get("sub")
-    if not auth_user_id:
-        raise _unauthorized("Token missing subject (sub)")
+    auth_user_id = payload["sub"]  # presence enforced by the verifier
 
     email = payload.get("email") or ""
     email_verified = payload.get("email_verified", False)  # Supabase includes this claim
@@ -144,6 +256,7 @@ def get_current_user(
             endpoint_path=endpoint,
             email_verified=bool(email_verified),
         )
+        _remember_auth(cache_key, payload, user.id)
         return user
     except HTTPException as e:
         # Enhanced logging for 409 errors (now only for unsafe conflicts)
@@ -166,8 +279,8 @@ def require_admin_user(
 
     Raises 403 Forbidden if user is not admin.
     """
-    # Parse admin allowlist from environment variable
-    admin_allowlist = parse_admin_allowlist(settings.ADMIN_EMAIL_ALLOWLIST)
+    # Admin allowlist, parsed once from the environment variable
+    admin_allowlist = settings.admin_emails
 
     if not current_user.email:
         logger.warning(
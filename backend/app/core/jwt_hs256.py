@@ -0,0 +1,105 @@
+"""
+Local HS256 verification for Supabase access tokens.
+
+Supabase signs access tokens with HS256 and the project JWT secret. The HMAC
+key schedule is done once per process and copied for each token, instead of
+python-jose re-deriving the key on every decode. Claims are checked the way
+jose.jwt.decode does (no leeway; aud when present; iss when configured), and
+failures raise jose's exception types so callers' except clauses are unchanged.
+Required claims (sub and exp by default, plus aud/iss when configured) are
+enforced in the same pass, so callers don't re-check the payload.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from jose import JWTError
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+class HS256Verifier:
+    """Verifies HS256 JWTs against one secret, audience and issuer."""
+
+    def __init__(
+        self,
+        secret: str,
+        audience: Optional[str] = None,
+        issuer: Optional[str] = None,
+        require: Tuple[str, ...] = ("sub", "exp"),
+    ):
+        self._mac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+        self.audience = audience
+        self.issuer = issuer
+        self.require = require + (("aud",) if audience is not None else ()) + (("iss",) if issuer is not None else ())
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Return the token's claims, or raise JWTError (or a subclass)."""
+        try:
+            signing_input, _, signature_b64 = token.rpartition(".")
+            header_b64, _, payload_b64 = signing_input.partition(".")
+            if not header_b64 or not payload_b64 or "." in payload_b64:
+                raise JWTError("Not enough segments")
+            header = json.loads(_b64url_decode(header_b64))
+            payload = _b64url_decode(payload_b64)
+            signature = _b64url_decode(signature_b64)
+            signing_bytes = signing_input.encode("ascii")
+        except ValueError as e:  # covers binascii, JSON and unicode errors
+            raise JWTError(f"Error decoding token: {e}")
+
+        if not isinstance(header, dict) or header.get("alg") != "HS256":
+            raise JWTError("The specified alg value is not allowed")
+
+        mac = self._mac.copy()
+        mac.update(signing_bytes)
+        if not hmac.compare_digest(mac.digest(), signature):
+            raise JWTError("Signature verification failed.")
+
+        try:
+            claims = json.loads(payload)
+        except ValueError as e:
+            raise JWTError(f"Invalid payload string: {e}")
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload string: must be a json object")
+
+        self._validate_claims(claims)
+        return claims
+
+    def _validate_claims(self, claims: Dict[str, Any]) -> None:
+        for name in self.require:
+            if not claims.get(name):
+                raise JWTClaimsError(f"Token is missing the \"{name}\" claim")
+
+        now = int(time.time())
+        times = {}
+        for name in ("iat", "nbf", "exp"):
+            if name in claims:
+                try:
+                    times[name] = int(claims[name])
+                except (TypeError, ValueError):
+                    raise JWTClaimsError(f"Claim ({name}) must be an integer.")
+        if "nbf" in times and times["nbf"] > now:
+            raise JWTClaimsError("The token is not yet valid (nbf)")
+        if "exp" in times and times["exp"] < now:
+            raise ExpiredSignatureError("Signature has expired.")
+
+        if "aud" in claims:
+            audiences = claims["aud"]
+            if isinstance(audiences, str):
+                audiences = [audiences]
+            if not isinstance(audiences, list) or any(not isinstance(a, str) for a in audiences):
+                raise JWTClaimsError("Invalid claim format in token")
+            if self.audience not in audiences:
+                raise JWTClaimsError("Invalid audience")
+
+        if self.issuer is not None and claims.get("iss") != self.issuer:
+            raise JWTClaimsError("Invalid issuer")
+
+        if "sub" in claims and not isinstance(claims["sub"], str):
+            raise JWTClaimsError("Subject must be a string.")
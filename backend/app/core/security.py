@@ -1,8 +1,11 @@
-from datetime import datetime, timedelta
+import time
+from datetime import timedelta
+from functools import lru_cache
 from typing import Optional
 from jose import JWTError, jwt
 # from passlib.context import CryptContext  # disabled for dev
 from app.core.config import settings
+from app.core.jwt_hs256 import HS256Verifier
 
 # DEV-ONLY: dummy password context that avoids bcrypt entirely.
 class DummyPasswordContext:
@@ -26,6 +29,10 @@ def _truncate_password(password: str) -> str:
     if password is None:
         return ""
 
+    # ASCII is one byte per char: short ASCII passwords need no encode
+    if type(password) is str and len(password) <= 72 and password.isascii():
+        return password
+
     if not isinstance(password, str):
         password = str(password)
 
@@ -52,20 +59,28 @@ def get_password_hash(password: str) -> str:
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
-    to_encode = data.copy()
+    # exp as epoch seconds: what the JWT carries anyway, without datetime arithmetic
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time()) + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = int(time.time()) + settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
     
-    to_encode.update({"exp": expire})
+    to_encode = {**data, "exp": expire}
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
 
+@lru_cache(maxsize=1)
+def _hs256_verifier() -> HS256Verifier:
+    # Same checks as jose.jwt.decode with no audience: exp/nbf/iat only if present
+    return HS256Verifier(settings.JWT_SECRET_KEY, require=())
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode and verify a JWT token."""
     try:
+        if settings.JWT_ALGORITHM == "HS256":
+            return _hs256_verifier().decode(token)
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         return payload
     except JWTError:
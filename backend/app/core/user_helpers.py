@@ -1,18 +1,64 @@
 """
 Helper functions for user management with Supabase auth.
 """
+from sqlalchemy import or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, OperationalError
 from fastapi import HTTPException
 from app.models import User, SubscriptionStatus
+from collections import OrderedDict
+from typing import Optional
 from uuid import UUID
 import logging
 import os
+import threading
+import time
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# auth_user_id -> (expires_at, users.id, email) for recently resolved users, so
+# the lookup is a primary-key Session.get (often an identity-map hit) instead
+# of a filtered SELECT, and a repeat login with the same email skips the email
+# checks too. Only the id and email are kept, never the ORM instance; a hit is
+# re-checked against the row's auth_user_id and email, so a relinked or
+# re-emailed row falls through to the full path.
+USER_ID_CACHE_TTL = 60.0
+USER_ID_CACHE_MAX = 10_000
+_user_id_cache: "OrderedDict[str, tuple[float, UUID, Optional[str]]]" = OrderedDict()
+_user_id_cache_lock = threading.Lock()
+
+
+def _cached_user(auth_user_id: str) -> Optional[tuple[UUID, Optional[str]]]:
+    """Return (user_id, email) for a still-valid cached auth_user_id, else None."""
+    with _user_id_cache_lock:
+        entry = _user_id_cache.get(auth_user_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del _user_id_cache[auth_user_id]
+            return None
+        _user_id_cache.move_to_end(auth_user_id)
+        return entry[1], entry[2]
+
+
+def _remember_user(auth_user_id: str, user_id: UUID, email: Optional[str]) -> None:
+    with _user_id_cache_lock:
+        _user_id_cache[auth_user_id] = (time.time() + USER_ID_CACHE_TTL, user_id, email)
+        _user_id_cache.move_to_end(auth_user_id)
+        while len(_user_id_cache) > USER_ID_CACHE_MAX:
+            _user_id_cache.popitem(last=False)
+
+
+def _forget_user_id(auth_user_id: str) -> None:
+    with _user_id_cache_lock:
+        _user_id_cache.pop(auth_user_id, None)
+
+
+_STATUS_BY_NAME = {status.name: status for status in SubscriptionStatus}
+_STATUS_BY_VALUE = {status.value: status for status in SubscriptionStatus}
+
 
 def _normalize_subscription_status(value) -> SubscriptionStatus:
     """
@@ -33,24 +79,39 @@ def _normalize_subscription_status(value) -> SubscriptionStatus:
         return value
     
     if isinstance(value, str):
-        value_upper = value.upper()
-        value_lower = value.lower()
-        
-        # Try to match by enum name (e.g., "FREE" -> SubscriptionStatus.FREE)
-        for status in SubscriptionStatus:
-            if status.name == value_upper:
-                return status
-        
-        # Try to match by enum value (e.g., "free" -> SubscriptionStatus.FREE)
-        for status in SubscriptionStatus:
-            if status.value == value_lower:
-                return status
+        # Match by enum name (e.g., "FREE" -> SubscriptionStatus.FREE), then by value ("free")
+        status = _STATUS_BY_NAME.get(value.upper()) or _STATUS_BY_VALUE.get(value.lower())
+        if status is not None:
+            return status
     
     # Default to FREE if we can't normalize
     logger.warning(f"Could not normalize subscription_status={value} (type={type(value)}), defaulting to FREE")
     return SubscriptionStatus.FREE
 
 
+EMAIL_LOCK_TIMEOUT_MS = 2000
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def _lock_email(db: Session, normalized_email: str) -> None:
+    """
+    Take pg_advisory_xact_lock for this email (PostgreSQL only).
+    
+    Waits at most EMAIL_LOCK_TIMEOUT_MS instead of queueing behind a stuck
+    holder; on timeout PostgreSQL raises lock_not_available (55P03), which
+    get_or_create_user_by_auth_id retries once. Every path after this call
+    commits or rolls back, so neither the lock nor the timeout outlives it.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    # SET LOCAL: the bound applies to the rest of this transaction only
+    db.execute(text(f"SET LOCAL lock_timeout = {EMAIL_LOCK_TIMEOUT_MS}"))
+    db.execute(
+        text("SELECT pg_advisory_xact_lock(hashtextextended(:k, 0))"),
+        {"k": f"readar:user_email:{normalized_email}"},
+    )
+
+
 def get_or_create_user_by_auth_id(
     db: Session,
     auth_user_id: str,
@@ -70,14 +131,16 @@ def get_or_create_user_by_auth_id(
     - This handles cases where Supabase auth_user_id changes but email remains the same.
     
     Logic:
-    1. Find user by auth_user_id first (primary lookup) - return if found
-    2. If not found AND email exists, query by email with row lock (FOR UPDATE)
+    1. Find user by auth_user_id first (primary lookup) - return if found.
+    2. If not found AND email exists, take an advisory lock on the email and
+       re-read the email row under it
     3. If found by email:
        - Legacy user (no auth_user_id) → link to current auth_user_id
        - Different auth_user_id → SAFE RELINK (update auth_user_id)
     4. If not found, create new user
     
-    Idempotent and safe under concurrent requests with row locking and IntegrityError handling.
+    Idempotent and safe under concurrent requests with per-email advisory locking,
+    INSERT ... ON CONFLICT and IntegrityError handling.
     
     Args:
         db: Database session
@@ -90,19 +153,64 @@ def get_or_create_user_by_auth_id(
         User object (existing or newly created)
     
     Raises:
-        HTTPException(409): Only for truly unsafe conflicts (auth_user_id already linked to different email)
+        HTTPException(409): Only for truly unsafe conflicts (auth_user_id already linked to different email),
+            or when the email lock stays busy past EMAIL_LOCK_TIMEOUT_MS twice in a row
     """
+    for attempt in range(2):
+        try:
+            return _get_or_create_user_by_auth_id(db, auth_user_id, email, endpoint_path, email_verified)
+        except HTTPException:
+            # End the transaction: _lock_email's SET LOCAL lock_timeout and the
+            # advisory lock must not carry over into the caller's statements
+            db.rollback()
+            raise
+        except OperationalError as e:
+            if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE:
+                raise
+            db.rollback()
+            logger.warning(
+                f"[AUTH_EMAIL_LOCK_BUSY] endpoint={endpoint_path}, "
+                f"auth_user_id={auth_user_id}, attempt={attempt + 1}"
+            )
+    raise HTTPException(
+        status_code=409,
+        detail="user_link_in_progress"
+    )
+
+
+def _get_or_create_user_by_auth_id(
+    db: Session,
+    auth_user_id: str,
+    email: str,
+    endpoint_path: str,
+    email_verified: bool,
+) -> User:
+    """get_or_create_user_by_auth_id without the lock-timeout retry."""
     DEBUG = os.getenv("DEBUG", "false").lower() == "true"
     
     # Normalize email once
     normalized_email = email.lower().strip() if email else None
     
     # Step A: Try to find existing user by auth_user_id (primary lookup)
-    user = db.query(User).filter(User.auth_user_id == auth_user_id).one_or_none()
+    user = None
+    cached = _cached_user(auth_user_id)
+    if cached is not None:
+        cached_id, cached_email = cached
+        user = db.get(User, cached_id)
+        if user is None or user.auth_user_id != auth_user_id:
+            _forget_user_id(auth_user_id)
+            user = None
+        elif user.email == cached_email and normalized_email in (None, (cached_email or "").lower().strip()):
+            # Same row, same email as last time: nothing to check or update
+            return user
+    if user is None:
+        # The email row is only needed in Step B, where it is read under the lock
+        user = db.scalars(select(User).where(User.auth_user_id == auth_user_id)).one_or_none()
     
     if user:
+        user_id = user.id  # read before any commit expires the instance
         if DEBUG:
-            logger.info(f"[get_or_create_user_by_auth_id] found_by_auth_user_id: auth_user_id={auth_user_id}, user_id={user.id}")
+            logger.info(f"[get_or_create_user_by_auth_id] found_by_auth_user_id: auth_user_id={auth_user_id}, user_id={user_id}")
         
         # Check for email mismatch: if token email differs from DB email, this is unsafe
         normalized_db_email = user.email.lower().strip() if user.email else None
@@ -119,75 +227,77 @@ def get_or_create_user_by_auth_id(
             )
         
         # Update email if provided and different (safe case: email matches or user has no email)
-        if normalized_email and user.email != normalized_email:
-            # Check if another row exists with that email and different auth_user_id
-            other = db.query(User).filter(
-                func.lower(User.email) == normalized_email,
-                User.auth_user_id != auth_user_id,
-                User.auth_user_id.isnot(None)
-            ).one_or_none()
-            
-            if other:
-                # Merge strategy: orphan the other row's email
-                # Since email is nullable, we can set it to NULL
-                other_email_backup = other.email
-                other.email = None
-                db.flush()  # Flush to apply the change
-                
+        # Compare normalized forms: a stored email differing only by case/whitespace
+        # is the same address (CITEXT), so repeat logins stay read-only
+        row_email = user.email
+        if normalized_email and normalized_email != normalized_db_email:
+            # Merge strategy: orphan the email on any other linked row that holds it
+            # (email is nullable). One UPDATE ... RETURNING replaces SELECT + flush.
+            # The target row is updated in a separate statement: ix_users_email is
+            # checked row by row, so a single CASE update could trip over the other row.
+            orphaned = db.execute(
+                update(User)
+                .where(
+                    User.email == normalized_email,
+                    User.auth_user_id != auth_user_id,
+                    User.auth_user_id.isnot(None),
+                )
+                .values(email=None)
+                .returning(User.id, User.auth_user_id)
+            ).all()
+            for other_id, other_auth_user_id in orphaned:
                 logger.warning(
                     f"[EMAIL_ORPHAN] Orphaned email from conflicting row: "
-                    f"email={other_email_backup}, other_user_id={other.id}, "
-                    f"other_auth_user_id={other.auth_user_id}, target_auth_user_id={auth_user_id}"
+                    f"email={normalized_email}, other_user_id={other_id}, "
+                    f"other_auth_user_id={other_auth_user_id}, target_auth_user_id={auth_user_id}"
                 )
             
             # Now set the email on the correct user
-            user.email = normalized_email
+            user.email = row_email = normalized_email
             try:
                 db.commit()
-                db.refresh(user)
             except IntegrityError:
                 # Race condition: another thread may have set this email
                 db.rollback()
+                _forget_user_id(auth_user_id)
                 # Re-fetch by auth_user_id and return
-                user = db.query(User).filter(User.auth_user_id == auth_user_id).one_or_none()
+                user = db.scalars(select(User).where(User.auth_user_id == auth_user_id)).one_or_none()
                 if user:
                     return user
                 raise
         
+        _remember_user(auth_user_id, user_id, row_email)
         return user
     
     # Step B: User does NOT exist by auth_user_id
-    # Check if a row exists by email (with row lock to prevent races)
+    # Check if a row exists by email (under a per-email lock to prevent races)
     existing_by_email = None
     if normalized_email:
-        # Use FOR UPDATE to lock the row during relink operation
-        existing_by_email = db.query(User).filter(
-            func.lower(User.email) == normalized_email
-        ).with_for_update().one_or_none()
-    
-    # Step B: User does NOT exist by auth_user_id
-    # Check if a row exists by email
-    existing_by_email = None
-    if normalized_email:
-        existing_by_email = db.query(User).filter(
-            func.lower(User.email) == normalized_email
-        ).one_or_none()
+        # Transaction-scoped advisory lock on the email: unlike FOR UPDATE it also
+        # serializes the case where no row exists yet. Released on commit/rollback.
+        _lock_email(db, normalized_email)
+        # Read under the lock so a row another sub inserted for this email is
+        # seen; populate_existing so an identity-map copy of it is overwritten
+        # with what's committed now
+        existing_by_email = db.scalars(select(User).where(
+            User.email == normalized_email
+        ).execution_options(populate_existing=True)).one_or_none()
     
     if existing_by_email:
         if not existing_by_email.auth_user_id:
             # Case 2a: Legacy row (no auth_user_id) - link it to this auth_user_id
             existing_by_email.auth_user_id = auth_user_id
+            user_id = existing_by_email.id
             try:
                 db.commit()
-                db.refresh(existing_by_email)
                 if DEBUG:
-                    logger.info(f"[get_or_create_user_by_auth_id] linked_legacy_user: user_id={existing_by_email.id}, auth_user_id={auth_user_id}")
+                    logger.info(f"[get_or_create_user_by_auth_id] linked_legacy_user: user_id={user_id}, auth_user_id={auth_user_id}")
                 return existing_by_email
             except IntegrityError:
                 # Race condition: another thread may have set this auth_user_id
                 db.rollback()
                 # Re-fetch by auth_user_id
-                user = db.query(User).filter(User.auth_user_id == auth_user_id).one_or_none()
+                user = db.scalars(select(User).where(User.auth_user_id == auth_user_id)).one_or_none()
                 if user:
                     return user
                 raise
@@ -223,9 +333,9 @@ def get_or_create_user_by_auth_id(
                 )
             
             # Check if auth_user_id already exists (unsafe conflict)
-            conflicting_user = db.query(User).filter(
+            conflicting_user = db.scalars(select(User).where(
                 User.auth_user_id == auth_user_id
-            ).one_or_none()
+            )).one_or_none()
             
             if conflicting_user and conflicting_user.id != existing_by_email.id:
                 # Unsafe: auth_user_id already linked to different email
@@ -243,10 +353,11 @@ def get_or_create_user_by_auth_id(
             # Safe relink: update existing user's auth_user_id
             old_auth_user_id = existing_by_email.auth_user_id
             existing_by_email.auth_user_id = auth_user_id
+            user_id = existing_by_email.id
             
             try:
                 db.commit()
-                db.refresh(existing_by_email)
+                _forget_user_id(old_auth_user_id)
                 
                 # Audit log: structured relink event
                 logger.warning(
@@ -254,19 +365,19 @@ def get_or_create_user_by_auth_id(
                     f"email={normalized_email}, "
                     f"old_auth_user_id={old_auth_user_id}, "
                     f"new_auth_user_id={auth_user_id}, "
-                    f"user_id={existing_by_email.id}, "
+                    f"user_id={user_id}, "
                     f"email_verified={email_verified}"
                 )
                 
                 if DEBUG:
-                    logger.info(f"[get_or_create_user_by_auth_id] relinked_user: user_id={existing_by_email.id}, auth_user_id={auth_user_id}")
+                    logger.info(f"[get_or_create_user_by_auth_id] relinked_user: user_id={user_id}, auth_user_id={auth_user_id}")
                 
                 return existing_by_email
             except IntegrityError as e:
                 # Race condition: another thread may have created this auth_user_id
                 db.rollback()
                 # Re-fetch by auth_user_id
-                user = db.query(User).filter(User.auth_user_id == auth_user_id).one_or_none()
+                user = db.scalars(select(User).where(User.auth_user_id == auth_user_id)).one_or_none()
                 if user:
                     if DEBUG:
                         logger.info(f"[get_or_create_user_by_auth_id] race_refetch_after_relink: auth_user_id={auth_user_id}, user_id={user.id}")
@@ -288,69 +399,68 @@ def get_or_create_user_by_auth_id(
             detail="email_claim_missing_cannot_create_user"
         )
     
-    normalized_status = _normalize_subscription_status(SubscriptionStatus.FREE)
-    final_email = normalized_email
-    
-    new_user = User(
-        auth_user_id=auth_user_id,
-        email=final_email,
-        subscription_status=normalized_status,
+    # INSERT ... ON CONFLICT DO NOTHING RETURNING: a concurrent request that created the
+    # same auth_user_id (or email) first makes this return no row instead of raising,
+    # so there is no rollback; the winner is then read once.
+    stmt = (
+        pg_insert(User)
+        .values(
+            auth_user_id=auth_user_id,
+            email=normalized_email,
+            subscription_status=SubscriptionStatus.FREE,
+        )
+        .on_conflict_do_nothing()
+        .returning(User)
     )
+    new_user = db.scalars(stmt).one_or_none()
     
-    # Runtime safety assertion: verify the value before commit
-    if hasattr(new_user, 'subscription_status'):
-        actual_value = new_user.subscription_status
-        if isinstance(actual_value, SubscriptionStatus):
-            actual_str = actual_value.value
-        else:
-            actual_str = str(actual_value)
-        
-        if actual_str != "free":
-            logger.error(
-                f"[SAFETY CHECK FAILED] subscription_status has wrong value: "
-                f"'{actual_str}' (expected 'free'). Normalizing..."
-            )
-            new_user.subscription_status = _normalize_subscription_status(actual_value)
-    
-    db.add(new_user)
-    
-    try:
+    if new_user is not None:
+        new_user_id = new_user.id
         db.commit()
-        db.refresh(new_user)
+        _remember_user(auth_user_id, new_user_id, normalized_email)
         
         if DEBUG:
-            logger.info(f"[get_or_create_user_by_auth_id] created_new: auth_user_id={auth_user_id}, user_id={new_user.id}, email={new_user.email}")
+            logger.info(f"[get_or_create_user_by_auth_id] created_new: auth_user_id={auth_user_id}, user_id={new_user_id}, email={normalized_email}")
         
-        logger.info(f"Created new user for auth_user_id={auth_user_id}, local_id={new_user.id}, subscription_status={new_user.subscription_status.value}")
+        logger.info(f"Created new user for auth_user_id={auth_user_id}, local_id={new_user_id}, subscription_status={SubscriptionStatus.FREE.value}")
         return new_user
-        
-    except IntegrityError as e:
-        db.rollback()
-        
-        if DEBUG:
-            logger.info(f"[get_or_create_user_by_auth_id] race_refetch: IntegrityError on create, re-fetching")
-        
-        # Race condition safety: re-fetch by auth_user_id first (primary)
-        user = db.query(User).filter(User.auth_user_id == auth_user_id).one_or_none()
-        if user:
-            if DEBUG:
-                logger.info(f"[get_or_create_user_by_auth_id] race_refetch_by_auth: auth_user_id={auth_user_id}, user_id={user.id}")
-            return user
-        
-        # Also try by email as fallback
-        if normalized_email:
-            user = db.query(User).filter(
-                func.lower(User.email) == normalized_email
-            ).one_or_none()
-            if user:
-                if DEBUG:
-                    logger.info(f"[get_or_create_user_by_auth_id] race_refetch_by_email: email={normalized_email}, user_id={user.id}")
-                return user
-        
-        # If we still can't find it, re-raise the original error
-        raise
-
-
-
-
-
+    
+    if DEBUG:
+        logger.info(f"[get_or_create_user_by_auth_id] race_refetch: conflict on create, re-fetching")
+    
+    # Race condition safety: only the row with this auth_user_id is a winner; an
+    # email row is taken over only if it is an unlinked legacy row (Case 2a)
+    winner = None
+    email_row = None
+    for row in db.scalars(select(User).where(
+        or_(User.auth_user_id == auth_user_id, User.email == normalized_email)
+    )).all():
+        if row.auth_user_id == auth_user_id:
+            winner = row
+        else:
+            email_row = row
+    if winner is None and email_row is not None and email_row.auth_user_id is None:
+        email_row.auth_user_id = auth_user_id
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="user_create_conflict")
+        winner = email_row
+    if winner is None:
+        # The conflicting row belongs to another auth_user_id, or was deleted
+        # again before we could read it
+        logger.error(
+            f"[AUTH_CONFLICT_409] endpoint={endpoint_path}, "
+            f"token_auth_user_id={auth_user_id}, token_email={normalized_email}, "
+            f"existing_user_id={email_row.id if email_row else None}, "
+            f"existing_auth_user_id={email_row.auth_user_id if email_row else None}, "
+            f"reason=create_conflict"
+        )
+        raise HTTPException(status_code=409, detail="user_create_conflict")
+    
+    winner_id = winner.id
+    db.commit()  # releases the email lock and its lock_timeout
+    if DEBUG:
+        logger.info(f"[get_or_create_user_by_auth_id] race_refetch: auth_user_id={auth_user_id}, user_id={winner_id}")
+    return winner
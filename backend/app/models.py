@@ -1,5 +1,5 @@
 from sqlalchemy import Column, String, Integer, Text, Boolean, DateTime, Date, ForeignKey, Enum as SQLEnum, JSON, ARRAY, Float, UniqueConstraint, event
-from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM as PostgresEnum
+from sqlalchemy.dialects.postgresql import UUID, JSONB, CITEXT
 from sqlalchemy.orm import relationship
 import uuid
 import enum
@@ -7,6 +7,7 @@ from datetime import datetime
 from enum import Enum
 import sqlalchemy as sa
 from app.database import Base
+from app.utils.ids import uuid7
 import logging
 
 logger = logging.getLogger(__name__)
@@ -47,18 +48,20 @@ class UserBookStatus(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()"))  # fetched via INSERT ... RETURNING
     auth_user_id = Column(String, unique=True, index=True, nullable=True)  # Supabase user UUID
-    email = Column(String, unique=True, index=True, nullable=True)  # Made nullable for Supabase users
+    email = Column(CITEXT, unique=True, index=True, nullable=True)  # Made nullable for Supabase users; CITEXT: case-insensitive equality and uniqueness
     password_hash = Column(String, nullable=True)  # Made nullable for Supabase users (no password needed)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=sa.text("timezone('utc', now())"))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=sa.text("timezone('utc', now())"))
     subscription_status = Column(
-        PostgresEnum(
+        SQLEnum(
             SubscriptionStatus,
             values_callable=lambda x: [e.value for e in x],
-            name="subscriptionstatus",
-            create_type=False,  # Type already exists in DB
+            native_enum=False,  # VARCHAR + CHECK: new values need no ALTER TYPE
+            length=32,
+            create_constraint=True,
+            name="ck_users_subscription_status",
         ),
         nullable=False,
         server_default="free",  # DB-level default as string value
@@ -89,7 +92,7 @@ class User(Base):
 class OnboardingProfile(Base):
     __tablename__ = "onboarding_profiles"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()"))  # fetched via INSERT ... RETURNING
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), unique=True, nullable=False)
     full_name = Column(String, nullable=True)  # Nullable: extracted from Supabase metadata if not provided
     age = Column(Integer, nullable=True)
@@ -102,11 +105,13 @@ class OnboardingProfile(Base):
     business_experience = Column(String, nullable=True)
     areas_of_business = Column(ARRAY(String), nullable=True)
     business_stage = Column(
-        PostgresEnum(
+        SQLEnum(
             BusinessStage,
             values_callable=lambda x: [e.value for e in x],
-            name="businessstage",
-            create_type=False,  # Type already exists in DB
+            native_enum=False,  # VARCHAR + CHECK: new values need no ALTER TYPE
+            length=32,
+            create_constraint=True,
+            name="ck_onboarding_profiles_business_stage",
         ),
         nullable=False,
     )
@@ -136,8 +141,8 @@ class OnboardingProfile(Base):
     transition_confirmed = Column(Boolean, nullable=True)
     transition_correction = Column(Text, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=sa.text("timezone('utc', now())"))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=sa.text("timezone('utc', now())"))
 
     # Relationships
     user = relationship("User", back_populates="onboarding_profile")
@@ -146,7 +151,7 @@ class OnboardingProfile(Base):
 class Book(Base):
     __tablename__ = "books"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()"))  # fetched via INSERT ... RETURNING
     external_id = Column(String, nullable=True)
     title = Column(String, nullable=False)
     subtitle = Column(String, nullable=True)
@@ -185,8 +190,8 @@ class Book(Base):
     core_frameworks = Column(JSONB, nullable=True)
     anti_patterns = Column(JSONB, nullable=True)
     outcomes = Column(JSONB, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=sa.text("timezone('utc', now())"))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=sa.text("timezone('utc', now())"))
     
     # Relationships
     user_interactions = relationship("UserBookInteraction", back_populates="book")
@@ -200,11 +205,11 @@ class PendingBook(Base):
     """
     __tablename__ = "pending_books"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)  # time-ordered: append-only PK index
     title = Column(String, nullable=False)
     author = Column(String, nullable=False)
-    isbn = Column(String, nullable=True)
-    isbn13 = Column(String, nullable=True)
+    isbn = Column(sa.CHAR(10), nullable=True)
+    isbn13 = Column(sa.CHAR(13), nullable=True)
     goodreads_id = Column(String, nullable=True)
     goodreads_url = Column(String, nullable=True)
     year_published = Column(Integer, nullable=True)
@@ -220,11 +225,16 @@ class PendingBook(Base):
     # Relationships
     catalog_book = relationship("Book", foreign_keys=[catalog_book_id])
 
+    __table_args__ = (
+        sa.Index('ix_pending_books_isbn13', 'isbn13', unique=True, postgresql_where=sa.text('isbn13 IS NOT NULL')),
+        sa.Index('ix_pending_books_not_added', 'created_at', postgresql_where=sa.text('added_to_catalog = false')),
+    )
+
 
 class UserBookInteraction(Base):
     __tablename__ = "user_book_interactions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()"))  # fetched via INSERT ... RETURNING
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     book_id = Column(UUID(as_uuid=True), ForeignKey("books.id"), nullable=False)
     status = Column(
@@ -237,8 +247,8 @@ class UserBookInteraction(Base):
     )
     rating = Column(Integer, nullable=True)
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=sa.text("timezone('utc', now())"))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=sa.text("timezone('utc', now())"))
     
     # Relationships
     user = relationship("User", back_populates="book_interactions")
@@ -248,9 +258,9 @@ class UserBookInteraction(Base):
 class RecommendationSession(Base):
     __tablename__ = "recommendation_sessions"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()"))  # fetched via INSERT ... RETURNING
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=sa.text("timezone('utc', now())"))
     request_payload = Column(JSON, nullable=True)
     results = Column(JSON, nullable=True)
     
@@ -268,7 +278,7 @@ class ReadingHistoryEntry(Base):
     isbn = Column(String, nullable=True)
     isbn13 = Column(String, nullable=True)
     my_rating = Column(Float, nullable=True)
-    date_read = Column(String, nullable=True)  # keep raw string from Goodreads for now
+    date_read = Column(Date, nullable=True)  # parsed from Goodreads' "Date Read" (YYYY/MM/DD)
     shelf = Column(String, nullable=True)
     source = Column(String, nullable=False, default="goodreads")
     # FK to Books catalog — set when matched/upserted during CSV import
@@ -316,16 +326,24 @@ class UserReadingProfile(Base):
 
 
 class EventLog(Base):
+    # In Postgres the table is RANGE-partitioned by month on created_at, with
+    # PRIMARY KEY (id, created_at); see app/services/event_log_partitions.py.
     __tablename__ = "event_logs"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    created_at = Column(DateTime(timezone=True), server_default=sa.func.now(), nullable=False, index=True)
-    user_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)  # time-ordered: append-only PK index
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=sa.func.now(), nullable=False)  # partition key
+    user_id = Column(UUID(as_uuid=True), nullable=True)
     event_name = Column(String, nullable=False, index=True)
     properties = Column(JSONB, nullable=True)
     request_id = Column(String, nullable=True)
     session_id = Column(String, nullable=True)
 
+    __table_args__ = (
+        sa.Index('ix_event_logs_user_event_created', 'user_id', 'event_name', sa.text('created_at DESC')),
+        sa.Index('ix_event_logs_created_at_brin', 'created_at', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+        sa.Index('ix_event_logs_properties', 'properties', postgresql_using='gin', postgresql_ops={'properties': 'jsonb_path_ops'}),
+    )
+
 
 class RecommendationEvent(Base):
     """
@@ -361,15 +379,20 @@ class UserBookStatusModel(Base):
     """
     __tablename__ = "user_book_status"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    book_id = Column(String, nullable=False, index=True)  # Using String to match book IDs (may be UUID or string)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)  # time-ordered: append-only PK index
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE", name="fk_user_book_status_user_id"), nullable=False)  # leftmost column of uq_user_book_status_user_book
+    # Catalog book id; as_uuid=False keeps it a str in Python (callers key maps on str(book.id))
+    book_id = Column(UUID(as_uuid=False), ForeignKey("books.id", ondelete="CASCADE", name="fk_user_book_status_book_id"), nullable=False, index=True)
     status = Column(String, nullable=False)  # one of: interested | read_liked | read_disliked | not_for_me
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     __table_args__ = (
         UniqueConstraint('user_id', 'book_id', name='uq_user_book_status_user_book'),
+        sa.Index(
+            'ix_user_book_status_active', 'user_id', sa.text('updated_at DESC'),
+            postgresql_where=sa.text("status IN ('interested', 'currently_reading')"),
+        ),
     )
 
 
@@ -391,9 +414,9 @@ class UserBookFeedback(Base):
     """
     __tablename__ = "user_book_feedback"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    book_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)  # time-ordered: append-only PK index
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE", name="fk_ubf_user"), nullable=False)  # leftmost column of idx_user_book_feedback_user_book
+    book_id = Column(UUID(as_uuid=True), ForeignKey("books.id", ondelete="CASCADE", name="fk_ubf_book"), nullable=False, index=True)
     sentiment = Column(
         SQLEnum(
             FeedbackSentiment,
@@ -414,7 +437,7 @@ class UserBookFeedback(Base):
     created_at = Column(DateTime(timezone=True), server_default=sa.func.now(), nullable=False)
 
     __table_args__ = (
-        sa.Index('idx_user_book_feedback_user_book', 'user_id', 'book_id'),
+        sa.Index('idx_user_book_feedback_user_book', 'user_id', 'book_id', postgresql_include=['state', 'sentiment']),
     )
 
 
@@ -43,7 +43,7 @@ def trigger_recommendation_emails(
     """Manually trigger the recommendations re-engagement email (admin/testing)."""
     only_user_id = None
     if only_email:
-        user = db.query(User).filter(func.lower(User.email) == only_email.lower()).first()
+        user = db.query(User).filter(User.email == only_email).first()
         if not user:
             return {"status": "error", "message": f"No user with email {only_email}"}
         only_user_id = user.id
@@ -61,7 +61,7 @@ def trigger_learning_tip_emails(
     """Manually trigger the learning-tips email (admin/testing)."""
     only_user_id = None
     if only_email:
-        user = db.query(User).filter(func.lower(User.email) == only_email.lower()).first()
+        user = db.query(User).filter(User.email == only_email).first()
         if not user:
             return {"status": "error", "message": f"No user with email {only_email}"}
         only_user_id = user.id
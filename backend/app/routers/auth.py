@@ -6,7 +6,7 @@ from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
 from app.core.security import verify_password, get_password_hash, create_access_token, decode_access_token
 from datetime import timedelta
 from app.core.config import settings
-from app.core.supabase_auth import get_supabase_user
+from app.core.auth import get_supabase_user
 from typing import Optional
 import uuid
 
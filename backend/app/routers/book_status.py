@@ -130,13 +130,22 @@ async def set_book_status(
     status_value = payload.status
     if status_value == "not_interested":
         status_value = "not_for_me"
+
+    # Status rows reference the catalog book by UUID; resolve external ids here.
+    book = _lookup_book(db, payload.book_id)
+    if book is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Book not found",
+        )
+    book_id = str(book.id)
     
     try:
         # Upsert into user_book_status
         existing = db.query(UserBookStatusModel).filter(
             and_(
                 UserBookStatusModel.user_id == user.id,
-                UserBookStatusModel.book_id == payload.book_id
+                UserBookStatusModel.book_id == book_id
             )
         ).first()
         
@@ -150,7 +159,7 @@ async def set_book_status(
             # Create new
             new_status = UserBookStatusModel(
                 user_id=user.id,
-                book_id=payload.book_id,
+                book_id=book_id,
                 status=status_value,
             )
             db.add(new_status)
@@ -161,25 +170,23 @@ async def set_book_status(
         # recommendation engine. If the book had a prior graded/interest
         # interaction, clear it so the Knowledge Map / scoring stays accurate.
         if status_value == "currently_reading":
-            _delete_interaction(db, user.id, payload.book_id)
+            _delete_interaction(db, user.id, book_id)
             db.commit()
 
         # Marking a book read feeds the user's reading history (powers the
         # "Books read" count, reading confidence, and the 50-book goal), then
         # rebuilds the reading profile in the background.
         if status_value in READ_RATING:
-            book = _lookup_book(db, payload.book_id)
-            if book is not None:
-                try:
-                    _record_read_in_history(db, user.id, book, status_value)
-                    db.commit()
-                    background_tasks.add_task(_regen_reading_profile, user.id)
-                except Exception as e:
-                    db.rollback()
-                    logger.warning(
-                        "Failed to record reading history for book_id=%s: %s",
-                        payload.book_id, e,
-                    )
+            try:
+                _record_read_in_history(db, user.id, book, status_value)
+                db.commit()
+                background_tasks.add_task(_regen_reading_profile, user.id)
+            except Exception as e:
+                db.rollback()
+                logger.warning(
+                    "Failed to record reading history for book_id=%s: %s",
+                    payload.book_id, e,
+                )
 
         # Log event (best-effort, must never fail the request)
         try:
@@ -243,8 +250,8 @@ def _delete_interaction(db: Session, user_id, book_id: str) -> None:
     """
     Delete the UserBookInteraction row for this user/book if present.
 
-    UserBookInteraction.book_id is a UUID FK, while book status uses a free-form
-    string id, so only attempt deletion when the id parses as a UUID.
+    UserBookInteraction.book_id is a UUID FK; a non-UUID id can't match any
+    row, so it is a no-op.
     """
     try:
         book_uuid = UUID(book_id)
@@ -271,13 +278,16 @@ async def delete_book_status(
     for the book, so the two stores can never drift out of sync.
     """
     try:
+        book = _lookup_book(db, book_id)
+        if book is None:
+            return {"ok": True}  # not a catalog book, so it can't be on any shelf
         db.query(UserBookStatusModel).filter(
             and_(
                 UserBookStatusModel.user_id == user.id,
-                UserBookStatusModel.book_id == book_id,
+                UserBookStatusModel.book_id == str(book.id),
             )
         ).delete(synchronize_session=False)
-        _delete_interaction(db, user.id, book_id)
+        _delete_interaction(db, user.id, str(book.id))
         db.commit()
         return {"ok": True}
     except Exception as e:
@@ -310,8 +320,11 @@ async def get_book_status_list(
     
     Returns array of book statuses, optionally joined with book titles/authors if available.
     """
-    query = db.query(UserBookStatusModel).filter(
-        UserBookStatusModel.user_id == user.id
+    # book_id is a FK to books.id, so title/author come from the same query
+    query = (
+        db.query(UserBookStatusModel, Book.title, Book.author_name)
+        .join(Book, Book.id == UserBookStatusModel.book_id)
+        .filter(UserBookStatusModel.user_id == user.id)
     )
     
     # Apply status filter if provided (support both new 'status' and legacy 'status_filter')
@@ -325,33 +338,14 @@ async def get_book_status_list(
     # Order by most recently updated
     query = query.order_by(UserBookStatusModel.updated_at.desc())
     
-    statuses = query.all()
-    
-    # Try to join with books table to get title/author
-    results = []
-    for status_obj in statuses:
-        # Try to find the book
-        book = None
-        try:
-            # Try UUID first
-            try:
-                book_uuid = UUID(status_obj.book_id)
-                book = db.query(Book).filter(Book.id == book_uuid).first()
-            except (ValueError, TypeError):
-                # Not a UUID -> can only be an external id. (Comparing the UUID
-                # Book.id column to a non-UUID string errors on Postgres.)
-                book = db.query(Book).filter(Book.external_id == status_obj.book_id).first()
-        except Exception as e:
-            logger.debug("Could not find book for book_id=%s: %s", status_obj.book_id, str(e))
-        
-        result = BookStatusResponse(
+    return [
+        BookStatusResponse(
             book_id=status_obj.book_id,
             status=status_obj.status,
             updated_at=status_obj.updated_at.isoformat() if status_obj.updated_at else "",
-            title=book.title if book else None,
-            author_name=book.author_name if book else None,
+            title=title,
+            author_name=author_name,
         )
-        results.append(result)
-    
-    return results
+        for status_obj, title, author_name in query.all()
+    ]
 
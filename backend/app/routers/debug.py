@@ -6,28 +6,21 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app import models
-from app.core.supabase_auth import get_supabase_user
-from app.core.user_helpers import get_or_create_user_by_auth_id
+from app.core.auth import get_current_user
 
 router = APIRouter(prefix="/debug", tags=["debug"])
 
 
 @router.get("/catalog-stats")
 async def catalog_stats(
-    current_user: dict = Depends(get_supabase_user),
+    current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
     Small debug endpoint to see what signal we have for the current user
     and whether there is any catalog data at all.
     """
-    # Get or create local user from Supabase auth_user_id
-    user = get_or_create_user_by_auth_id(
-        db=db,
-        auth_user_id=current_user["auth_user_id"],
-        email=current_user.get("email", ""),
-    )
-    user_id = user.id
+    user_id = current_user.id
     
     books_count = db.query(models.Book).count()
     interactions_count = (
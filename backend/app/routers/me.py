@@ -8,7 +8,7 @@ from app.schemas.user import (
     NotificationPreferences,
     NotificationPreferencesUpdate,
 )
-from app.core.admin import parse_admin_allowlist, is_admin_email
+from app.core.admin import is_admin_email
 from app.core.config import settings
 
 router = APIRouter(prefix="/me", tags=["me"])
@@ -21,9 +21,8 @@ def me(current_user: User = Depends(get_current_user)):
 
     Returns user details including admin status based on ADMIN_EMAIL_ALLOWLIST.
     """
-    # Parse admin allowlist from environment and check if user is admin
-    admin_allowlist = parse_admin_allowlist(settings.ADMIN_EMAIL_ALLOWLIST)
-    user_is_admin = is_admin_email(current_user.email, admin_allowlist)
+    # Check the (parsed-once) admin allowlist
+    user_is_admin = is_admin_email(current_user.email, settings.admin_emails)
 
     return {
         "id": str(current_user.id),
@@ -17,6 +17,7 @@ import os
 import re
 import time
 import uuid as uuid_lib
+from datetime import date, datetime
 from io import TextIOWrapper
 from typing import List, Optional
 from uuid import UUID
@@ -109,6 +110,22 @@ def normalize_isbn(value: str | None) -> str | None:
     return value if value else None
 
 
+_DATE_READ_FORMATS = ("%Y/%m/%d", "%Y-%m-%d", "%m/%d/%Y")
+
+
+def parse_date_read(value: str | None) -> date | None:
+    """Parse Goodreads' "Date Read" (normally YYYY/MM/DD); None if blank or unparseable."""
+    if not value:
+        return None
+    value = value.strip()
+    for fmt in _DATE_READ_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
 def canonical_title_key(title: str, author: str) -> tuple[str, str]:
     """
     Build a de-duplication key that collapses edition/subtitle variants of the
@@ -152,7 +169,7 @@ def _upsert_reading_history_entry(
     isbn: str | None,
     isbn13: str | None,
     my_rating: float | None,
-    date_read: str | None,
+    date_read: date | None,
     shelf: str | None,
     catalog_book_id: UUID | None,
 ) -> tuple[ReadingHistoryEntry, bool]:
@@ -445,7 +462,7 @@ async def upload_reading_history_csv(
             pass
 
         shelf = (row.get("Exclusive Shelf") or row.get("Bookshelves") or "").strip().lower() or None
-        date_read = (row.get("Date Read") or "").strip() or None
+        date_read = parse_date_read(row.get("Date Read"))
 
         # Look up catalog book from in-memory dicts — no DB query.
         # Order: exact ISBN → exact title+author → canonical (edition-collapsed).
@@ -579,7 +596,7 @@ def get_reading_history(
             title=e.title,
             author=e.author,
             my_rating=e.my_rating,
-            date_read=e.date_read,
+            date_read=e.date_read.isoformat() if e.date_read else None,
             shelf=e.shelf,
             catalog_book_id=str(e.catalog_book_id) if e.catalog_book_id else None,
         )
@@ -11,6 +11,7 @@ from app.database import SessionLocal
 from app.utils.email import send_weekly_pending_books_email
 from app.services.reengagement import send_recommendation_emails
 from app.services.learning_tips import send_learning_tip_emails
+from app.services.event_log_partitions import ensure_event_log_partitions
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +68,22 @@ def send_learning_tip_emails_job():
         db.close()
 
 
+def ensure_event_log_partitions_job():
+    """
+    Scheduled job: keep a year of monthly event_logs partitions ahead of now.
+    Runs once at startup and on the 1st of each month.
+    """
+    logger.info("Running event_logs partition job")
+    db: Session = SessionLocal()
+    try:
+        created = ensure_event_log_partitions(db)
+        logger.info(f"Event_logs partition job completed: created={created}")
+    except Exception as e:
+        logger.exception(f"Event_logs partition job failed: {e}")
+    finally:
+        db.close()
+
+
 def start_scheduler():
     """
     Start the background scheduler with all configured jobs.
@@ -109,8 +126,24 @@ def start_scheduler():
         replace_existing=True
     )
 
+    # event_logs partitions: 1st of every month at 03:00 UTC
+    scheduler.add_job(
+        ensure_event_log_partitions_job,
+        trigger=CronTrigger(day=1, hour=3, minute=0),
+        id='event_logs_partitions',
+        name='Create upcoming event_logs partitions',
+        replace_existing=True
+    )
+    # ...and once now: the migrations only pre-create partitions from a fixed month
+    scheduler.add_job(
+        ensure_event_log_partitions_job,
+        id='event_logs_partitions_startup',
+        name='Create current event_logs partitions at startup',
+        replace_existing=True
+    )
+
     scheduler.start()
-    logger.info("Background scheduler started with weekly report + re-engagement + learning-tips jobs")
+    logger.info("Background scheduler started with weekly report + re-engagement + learning-tips + partition jobs")
 
 
 def stop_scheduler():
@@ -38,8 +38,9 @@ def find_duplicate_emails(db: Session) -> list:
 
 def get_users_by_email(db: Session, email_lower: str) -> list:
     """Get all users with the same email (case-insensitive)."""
+    # CITEXT equality is case-insensitive and can use ix_users_email
     return db.query(User).filter(
-        func.lower(User.email) == email_lower
+        User.email == email_lower
     ).all()
 
 
@@ -20,7 +20,6 @@ Example:
 import argparse
 import sys
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.database import SessionLocal
 from app.models import User, OnboardingProfile, ReadingHistoryEntry, UserBookInteraction
@@ -115,9 +114,9 @@ def diagnose_email(email: str):
     
     db: Session = SessionLocal()
     try:
-        # Query for all users with this email (case-insensitive)
+        # Query for all users with this email (CITEXT: case-insensitive, uses ix_users_email)
         users = db.query(User).filter(
-            func.lower(User.email) == normalized_email
+            User.email == normalized_email
         ).all()
         
         if not users:
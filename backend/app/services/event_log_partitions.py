@@ -0,0 +1,117 @@
+"""
+Monthly RANGE partitions for event_logs.
+
+event_logs is partitioned by created_at, one partition per UTC month
+(event_logs_yYYYYmMM), plus a DEFAULT partition as a safety net. Retention
+is then a DROP TABLE of an old month instead of a slow DELETE. The
+migrations pre-create a year of partitions from a fixed month; the scheduler
+calls ensure_event_log_partitions() at startup and monthly to keep a year of
+runway from now.
+"""
+import logging
+import time
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+MONTHS_AHEAD = 12
+
+# Creating a partition (and the DEFAULT rescue path) locks event_logs; bound the
+# wait so a busy table delays the job instead of stalling inserts behind it.
+PARTITION_LOCK_TIMEOUT_MS = 2000
+PARTITION_LOCK_ATTEMPTS = 3
+PARTITION_RETRY_DELAY_SECS = 5.0
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def _add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month_start: date) -> str:
+    return f"event_logs_y{month_start.year:04d}m{month_start.month:02d}"
+
+
+def _create_partition(db: Session, name: str, start: date, end: date) -> None:
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    in_default = db.execute(text(
+        "SELECT to_regclass('event_logs_default') IS NOT NULL AND EXISTS ("
+        "SELECT 1 FROM event_logs_default WHERE created_at >= :start AND created_at < :end)"
+    ), {"start": start, "end": end}).scalar()
+    if not in_default:
+        db.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF event_logs {bounds}"))
+        return
+
+    # Rows for this month already landed in DEFAULT (the month had no partition
+    # yet); Postgres refuses the new partition until they move. Detach DEFAULT,
+    # create the month, move its rows over, and re-attach DEFAULT.
+    range_filter = f"created_at >= '{start.isoformat()}' AND created_at < '{end.isoformat()}'"
+    db.execute(text("ALTER TABLE event_logs DETACH PARTITION event_logs_default"))
+    db.execute(text(f"CREATE TABLE {name} PARTITION OF event_logs {bounds}"))
+    db.execute(text(f"INSERT INTO {name} SELECT * FROM event_logs_default WHERE {range_filter}"))
+    db.execute(text(f"DELETE FROM event_logs_default WHERE {range_filter}"))
+    db.execute(text("ALTER TABLE event_logs ATTACH PARTITION event_logs_default DEFAULT"))
+    logger.warning(f"[event_log_partitions] moved rows for {name} out of event_logs_default")
+
+
+def ensure_event_log_partitions(db: Session, months_ahead: int = MONTHS_AHEAD) -> list:
+    """
+    Create any missing monthly partitions from the current month through
+    months_ahead months out. Returns the names of partitions created.
+    No-op when event_logs is not partitioned (e.g. a create_all() test DB).
+
+    Instances serialize on an advisory lock, and every lock is bounded by
+    PARTITION_LOCK_TIMEOUT_MS; on lock_not_available the run is retried up to
+    PARTITION_LOCK_ATTEMPTS times, then left to the next scheduled run.
+    """
+    for attempt in range(1, PARTITION_LOCK_ATTEMPTS + 1):
+        try:
+            return _ensure_event_log_partitions(db, months_ahead)
+        except OperationalError as e:
+            if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE:
+                raise
+            db.rollback()
+            logger.warning(f"[event_log_partitions] event_logs busy, attempt={attempt}")
+            if attempt < PARTITION_LOCK_ATTEMPTS:
+                time.sleep(PARTITION_RETRY_DELAY_SECS)
+    return []
+
+
+def _ensure_event_log_partitions(db: Session, months_ahead: int) -> list:
+    """ensure_event_log_partitions without the lock-timeout retry."""
+    partitioned = db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('event_logs'))"
+    )).scalar()
+    if not partitioned:
+        return []
+
+    # SET LOCAL: the bound applies to this transaction only. The advisory lock
+    # keeps instances starting together from racing on DETACH/CREATE; it is
+    # released on commit/rollback, and existing partitions are read after it.
+    db.execute(text(f"SET LOCAL lock_timeout = {PARTITION_LOCK_TIMEOUT_MS}"))
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtextextended('readar:event_logs_partitions', 0))"))
+
+    existing = set(db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'event_logs'::regclass"
+    )).scalars())
+
+    first = datetime.now(timezone.utc).date().replace(day=1)
+    created = []
+    for offset in range(months_ahead + 1):
+        start = _add_months(first, offset)
+        name = partition_name(start)
+        if name in existing:
+            continue
+        _create_partition(db, name, start, _add_months(start, 1))
+        created.append(name)
+    db.commit()
+
+    if created:
+        logger.info(f"[event_log_partitions] created {created}")
+    return created
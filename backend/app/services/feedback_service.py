@@ -83,8 +83,11 @@ def submit_feedback(
         return True
         
     except IntegrityError as e:
-        # Handle race condition where duplicate is inserted between check and insert
         db.rollback()
+        if getattr(e.orig, "pgcode", None) == "23503":  # foreign_key_violation
+            logger.warning(f"Feedback for unknown user or book ignored: user_id={user_id}, book_id={book_id}")
+            return False
+        # Handle race condition where duplicate is inserted between check and insert
         logger.debug(f"Duplicate feedback (race condition): user_id={user_id}, book_id={book_id}, state={state}")
         return True
     except Exception as e:
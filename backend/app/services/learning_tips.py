@@ -11,8 +11,8 @@ Mirrors app/services/reengagement.py.
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from uuid import UUID
 
-from sqlalchemy import cast, String
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -115,12 +115,7 @@ def _current_book_for_user(db: Session, user_id) -> Optional[Book]:
     )
     if not status_row:
         return None
-    # book_id is stored as String; Book.id is UUID — compare on the string form.
-    return (
-        db.query(Book)
-        .filter(cast(Book.id, String) == str(status_row.book_id))
-        .first()
-    )
+    return db.query(Book).filter(Book.id == UUID(status_row.book_id)).first()
 
 
 def send_learning_tip_emails(
@@ -2412,7 +2412,7 @@ def get_personalized_recommendations(
         t3 = now_ms()
     
     # Build dict mapping book_id (as string) to status
-    # Note: UserBookStatusModel.book_id is String, Book.id is UUID
+    # Note: UserBookStatusModel.book_id is a uuid column mapped as str (as_uuid=False)
     book_status_map: Dict[str, str] = {
         status_obj.book_id: status_obj.status
         for status_obj in user_book_statuses
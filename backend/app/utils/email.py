@@ -27,7 +27,7 @@ EMAIL_FROM = "Readar <auth@readar.ai>"
 def _app_url() -> str:
     """Public app URL for email CTAs (first FRONTEND_ORIGINS entry, or default)."""
     from app.core.config import settings
-    raw = getattr(settings, "FRONTEND_ORIGINS", None)
+    raw = settings.FRONTEND_ORIGINS
     if raw and raw.strip():
         first = raw.split(",")[0].strip()
         if first:
@@ -66,27 +66,10 @@ def engine():
     # Create Postgres enum types before creating tables
     # These are required for PostgresEnum columns
     with test_engine.connect() as conn:
+        # users.email is CITEXT
+        conn.execute(sa_text("CREATE EXTENSION IF NOT EXISTS citext"))
+
         # Create enum types if they don't exist (idempotent)
-        conn.execute(sa_text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'subscriptionstatus') THEN
-                    CREATE TYPE subscriptionstatus AS ENUM ('free', 'active', 'canceled');
-                END IF;
-            END
-            $$;
-        """))
-        
-        conn.execute(sa_text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'businessstage') THEN
-                    CREATE TYPE businessstage AS ENUM ('idea', 'pre-revenue', 'early-revenue', 'scaling');
-                END IF;
-            END
-            $$;
-        """))
-        
         conn.execute(sa_text("""
             DO $$
             BEGIN
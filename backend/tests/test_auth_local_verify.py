@@ -0,0 +1,36 @@
+"""Token verification in app.core.auth is local (HS256 against the JWT secret): no network I/O."""
+import socket
+import time
+from types import SimpleNamespace
+
+import pytest
+from jose import jwt
+
+from app.core import auth
+from app.core.jwt_hs256 import HS256Verifier
+
+SECRET = "test-jwt-secret"
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+    def refuse(*args, **kwargs):
+        raise AssertionError("network I/O during token verification")
+
+    monkeypatch.setattr(socket.socket, "connect", refuse)
+    monkeypatch.setattr(socket, "create_connection", refuse)
+    monkeypatch.setattr(socket, "getaddrinfo", refuse)
+
+
+def test_get_supabase_user_verifies_locally(monkeypatch, no_network):
+    monkeypatch.setattr(auth, "_verifier", HS256Verifier(SECRET, audience="authenticated"))
+    token = jwt.encode(
+        {"sub": "user-1", "email": "a@example.com", "aud": "authenticated", "exp": int(time.time()) + 60},
+        SECRET,
+        algorithm="HS256",
+    )
+    request = SimpleNamespace(headers={"Authorization": f"Bearer {token}"})
+
+    identity = auth.get_supabase_user(request)
+    assert identity["auth_user_id"] == "user-1"
+    assert identity["email"] == "a@example.com"
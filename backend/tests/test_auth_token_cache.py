@@ -0,0 +1,88 @@
+"""Unit tests for the verified-token cache in app.core.auth. No database required."""
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core import auth
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    auth._token_cache.clear()
+    auth._bad_token_cache.clear()
+    yield
+    auth._token_cache.clear()
+    auth._bad_token_cache.clear()
+
+
+def test_hit_returns_payload_and_user_id():
+    key = auth._token_key("token-a")
+    user_id = uuid4()
+    payload = {"sub": "abc", "exp": time.time() + 3600}
+    auth._remember_auth(key, payload, user_id)
+    assert auth._cached_auth(key) == (payload, user_id)
+    assert auth._cached_auth(auth._token_key("token-b")) is None
+
+
+def test_entry_never_outlives_token_exp():
+    key = auth._token_key("token-a")
+    auth._remember_auth(key, {"sub": "abc", "exp": time.time() - 1}, uuid4())
+    assert auth._cached_auth(key) is None
+
+
+def test_expired_entry_is_dropped():
+    key = auth._token_key("token-a")
+    auth._remember_auth(key, {"sub": "abc", "exp": time.time() + 3600}, uuid4())
+    auth._token_cache[key] = (time.time() - 1,) + auth._token_cache[key][1:]
+    assert auth._cached_auth(key) is None
+    assert key not in auth._token_cache
+
+
+def test_oldest_entries_evicted_past_max(monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_CACHE_MAX", 2)
+    keys = [auth._token_key(f"token-{i}") for i in range(3)]
+    for key in keys:
+        auth._remember_auth(key, {"sub": "abc"}, uuid4())
+    assert auth._cached_auth(keys[0]) is None
+    assert auth._cached_auth(keys[2]) is not None
+
+
+def test_get_supabase_user_decodes_repeat_token_once(monkeypatch):
+    calls = []
+
+    def decode(token, cache_key):
+        calls.append(token)
+        return {"sub": "abc", "email": "a@example.com", "exp": time.time() + 3600}
+
+    monkeypatch.setattr(auth, "_decode_supabase_jwt", decode)
+    request = SimpleNamespace(headers={"Authorization": "Bearer token-a"})
+    first = auth.get_supabase_user(request)
+    second = auth.get_supabase_user(request)
+    assert first == second
+    assert calls == ["token-a"]
+    # Shared with get_current_user, which still has to resolve the user
+    assert auth._cached_auth(auth._token_key("token-a"))[1] is None
+
+
+def test_rejected_token_is_not_reverified(monkeypatch):
+    calls = []
+
+    class Verifier:
+        def decode(self, token):
+            calls.append(token)
+            raise auth.JWTError("Signature verification failed.")
+
+    monkeypatch.setattr(auth, "_verifier", Verifier())
+    key = auth._token_key("bad-token")
+    for _ in range(3):
+        with pytest.raises(auth.HTTPException) as exc:
+            auth._decode_supabase_jwt("bad-token", key)
+        assert exc.value.status_code == 401
+    assert calls == ["bad-token"]
+
+    auth._bad_token_cache[key] = time.time() - 1
+    with pytest.raises(auth.HTTPException):
+        auth._decode_supabase_jwt("bad-token", key)
+    assert calls == ["bad-token", "bad-token"]
@@ -137,6 +137,17 @@ def test_invalid_status_returns_400(db: Session, user: User):
         app.dependency_overrides.clear()
 
 
+def test_unknown_book_returns_404(db: Session, user: User):
+    """Status rows reference books.id, so an id with no catalog book is rejected."""
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        client = TestClient(app)
+        resp = client.post("/api/book-status", json={"book_id": str(uuid4()), "status": "interested"})
+        assert resp.status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+
+
 def test_book_status_requires_auth():
     """No credentials -> rejected (401/403), never an anonymous write."""
     client = TestClient(app)
@@ -0,0 +1,25 @@
+"""Tests for monthly event_logs partition management."""
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.services.event_log_partitions import (
+    _add_months,
+    partition_name,
+    ensure_event_log_partitions,
+)
+
+
+def test_add_months_rolls_over_year():
+    assert _add_months(date(2026, 11, 1), 1) == date(2026, 12, 1)
+    assert _add_months(date(2026, 12, 1), 1) == date(2027, 1, 1)
+    assert _add_months(date(2026, 10, 1), 14) == date(2027, 12, 1)
+
+
+def test_partition_name_is_zero_padded():
+    assert partition_name(date(2027, 3, 1)) == "event_logs_y2027m03"
+
+
+def test_ensure_partitions_noop_on_unpartitioned_table(db: Session):
+    # create_all() builds a plain event_logs table in the test database
+    assert ensure_event_log_partitions(db) == []
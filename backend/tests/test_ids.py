@@ -0,0 +1,24 @@
+"""Unit tests for time-ordered ids (uuid7). Pure function — no database required."""
+import time
+import uuid
+
+from app.utils.ids import uuid7
+
+
+def test_version_and_variant():
+    u = uuid7()
+    assert u.version == 7
+    assert u.variant == uuid.RFC_4122
+
+
+def test_embeds_current_unix_ms():
+    before = time.time_ns() // 1_000_000
+    u = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert before <= u.int >> 80 <= after
+
+
+def test_later_ids_sort_after_earlier_ones():
+    first = uuid7()
+    time.sleep(0.002)
+    assert uuid7() > first
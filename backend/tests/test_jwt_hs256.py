@@ -0,0 +1,77 @@
+"""Unit tests for the local HS256 verifier (app.core.jwt_hs256). No database required."""
+import time
+
+import pytest
+from jose import JWTError, jwt
+from jose.exceptions import ExpiredSignatureError
+
+from app.core.jwt_hs256 import HS256Verifier
+
+SECRET = "test-jwt-secret"
+ISS = "https://example.supabase.co/auth/v1"
+
+
+@pytest.fixture
+def verifier() -> HS256Verifier:
+    return HS256Verifier(SECRET, audience="authenticated", issuer=ISS)
+
+
+def _token(secret: str = SECRET, algorithm: str = "HS256", **overrides) -> str:
+    claims = {"sub": "user-1", "aud": "authenticated", "iss": ISS, "exp": int(time.time()) + 60}
+    claims.update(overrides)
+    return jwt.encode({k: v for k, v in claims.items() if v is not None}, secret, algorithm=algorithm)
+
+
+def test_valid_token_returns_claims(verifier):
+    assert verifier.decode(_token())["sub"] == "user-1"
+
+
+def test_wrong_secret_rejected(verifier):
+    with pytest.raises(JWTError):
+        verifier.decode(_token(secret="other-secret"))
+
+
+def test_other_algorithm_rejected(verifier):
+    with pytest.raises(JWTError):
+        verifier.decode(_token(algorithm="HS512"))
+
+
+def test_expired_token_rejected(verifier):
+    with pytest.raises(ExpiredSignatureError):
+        verifier.decode(_token(exp=int(time.time()) - 5))
+
+
+def test_not_yet_valid_token_rejected(verifier):
+    with pytest.raises(JWTError):
+        verifier.decode(_token(nbf=int(time.time()) + 300))
+
+
+@pytest.mark.parametrize("claims", [{"aud": "anon"}, {"iss": "https://evil.example"}, {"iss": None}])
+def test_audience_and_issuer_enforced(verifier, claims):
+    with pytest.raises(JWTError):
+        verifier.decode(_token(**claims))
+
+
+def test_malformed_token_rejected(verifier):
+    for bad in ("", "abc", "a.b", "a.b.c.d", _token() + "x"):
+        with pytest.raises(JWTError):
+            verifier.decode(bad)
+
+
+@pytest.mark.parametrize("claim", ["sub", "exp", "aud", "iss"])
+def test_required_claims_enforced(verifier, claim):
+    with pytest.raises(JWTError):
+        verifier.decode(_token(**{claim: None}))
+
+
+def test_empty_subject_rejected(verifier):
+    with pytest.raises(JWTError):
+        verifier.decode(_token(sub=""))
+
+
+def test_access_token_round_trip():
+    from app.core.security import create_access_token, decode_access_token
+
+    token = create_access_token({"sub": "user-1"})
+    assert decode_access_token(token)["sub"] == "user-1"
+    assert decode_access_token(token + "x") is None
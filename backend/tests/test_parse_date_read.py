@@ -0,0 +1,24 @@
+"""Unit tests for parsing Goodreads' "Date Read" column (parse_date_read).
+
+date_read is stored as a DATE, so the CSV string must become a date or None —
+never a value that would fail the insert. Pure function — no database required.
+"""
+from datetime import date
+
+from app.routers.reading_history import parse_date_read
+
+
+def test_goodreads_format():
+    assert parse_date_read("2023/05/14") == date(2023, 5, 14)
+
+
+def test_iso_and_us_formats():
+    assert parse_date_read("2023-05-14") == date(2023, 5, 14)
+    assert parse_date_read("05/14/2023") == date(2023, 5, 14)
+
+
+def test_blank_and_garbage_are_none():
+    assert parse_date_read(None) is None
+    assert parse_date_read("   ") is None
+    assert parse_date_read("sometime in 2023") is None
+    assert parse_date_read("2023/02/30") is None
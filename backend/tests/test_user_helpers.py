@@ -285,3 +285,20 @@ def test_auto_repair_email_drift(db: Session):
     old_user = db.query(User).filter(User.auth_user_id == old_auth_user_id).one_or_none()
     assert old_user is None
 
+
+
+def test_get_or_create_user_by_auth_id_ignores_stale_cached_id(db: Session):
+    """A cached id whose row was relinked to another auth_user_id is not returned."""
+    from app.core import user_helpers
+
+    auth_user_id = str(uuid4())
+    user = get_or_create_user_by_auth_id(db=db, auth_user_id=auth_user_id, email="cached@example.com")
+    assert user_helpers._cached_user(auth_user_id) == (user.id, "cached@example.com")
+
+    user.auth_user_id = str(uuid4())
+    db.commit()
+
+    other = get_or_create_user_by_auth_id(db=db, auth_user_id=auth_user_id, email="fresh@example.com")
+    assert other.id != user.id
+    # The stale entry was dropped; the newly created user replaced it
+    assert user_helpers._cached_user(auth_user_id) == (other.id, "fresh@example.com")